@@ -0,0 +1,117 @@
+import argparse
+import csv
+import json
+import math
+import os
+import statistics
+import time
+from concurrent.futures import ProcessPoolExecutor
+from Corpus import DEFAULT_DIRECTORY, SUITES, Corpus
+from Engine import SOLVERS
+from Generators import GENERATORS
+from MazeFile import load_maze
+from Stats import Stats, measure
+
+# Benchmark every solver on a set of mazes across a process pool.
+#
+#   python Bench.py --sizes 10 50 100 500 --count 3 --repeat 5 --output results
+#   python Bench.py --suite standard
+#
+# Mazes come from the seeded corpus (see Corpus.py), so they are generated
+# once and every later run benchmarks identical inputs, unless --mazes names
+# the files to use. Every (maze, solver) pair runs as its own job. Results
+# are written to <output>.csv and <output>.json.
+
+FIELDS = ["maze", "width", "height", "solver", "path_length", "nodes_expanded",
+          "edges_relaxed", "peak_frontier", "stale_pops", "repeats", "median_ms",
+          "p95_ms", "peak_kib"]
+
+# Nearest-rank percentile of an already sorted list
+def percentile(values, fraction):
+    return values[max(0, math.ceil(fraction * len(values)) - 1)]
+
+def run_benchmark(filename, label, solver, repeats):
+    maze = load_maze(filename)
+    solve = SOLVERS[solver]
+
+    timings = []
+    for _ in range(repeats):
+        start_time = time.perf_counter_ns()
+        path, _ = solve(maze)
+        timings.append(time.perf_counter_ns() - start_time)
+    timings.sort()
+
+    # Counters and memory come from a separate run so they do not skew the timings
+    stats = Stats(memory=True)
+    measure(solve, maze, stats=stats)
+
+    return {
+        "maze": label,
+        "width": maze.width,
+        "height": maze.height,
+        "solver": solver,
+        "path_length": len(path),
+        "nodes_expanded": stats.nodes_expanded,
+        "edges_relaxed": stats.edges_relaxed,
+        "peak_frontier": stats.peak_frontier,
+        "stale_pops": stats.stale_pops,
+        "repeats": repeats,
+        "median_ms": statistics.median(timings) / 1e6,
+        "p95_ms": percentile(timings, 0.95) / 1e6,
+        "peak_kib": stats.peak_memory / 1024,
+    }
+
+def write_results(results, output):
+    with open(f"{output}.csv", mode='w', newline='') as file:
+        writer = csv.DictWriter(file, fieldnames=FIELDS)
+        writer.writeheader()
+        writer.writerows(results)
+    with open(f"{output}.json", mode='w') as file:
+        json.dump(results, file, indent=2)
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the maze solvers")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 50, 100, 500, 1000, 2000], help="square maze sizes to generate")
+    parser.add_argument("--count", type=int, default=1, help="mazes per size")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default="hunt_and_kill")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the first generated maze")
+    parser.add_argument("--suite", choices=list(SUITES), help="benchmark a named corpus suite instead of --sizes")
+    parser.add_argument("--corpus", default=DEFAULT_DIRECTORY, help="directory of cached corpus mazes")
+    parser.add_argument("--mazes", nargs="+", help="benchmark these maze files instead of the corpus")
+    parser.add_argument("--solvers", nargs="+", choices=list(SOLVERS), default=list(SOLVERS))
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--output", default="results")
+    args = parser.parse_args()
+
+    with ProcessPoolExecutor(args.workers) as pool:
+        if args.mazes:
+            filenames = args.mazes
+            labels = args.mazes
+        else:
+            if args.suite:
+                entries = SUITES[args.suite]
+            else:
+                entries = []
+                seed = args.seed
+                for size in args.sizes:
+                    for _ in range(args.count):
+                        entries.append((args.algorithm, size, size, seed))
+                        seed += 1
+            filenames = Corpus(args.corpus).build(entries, pool)
+            labels = [os.path.basename(filename) for filename in filenames]
+
+        jobs = [pool.submit(run_benchmark, filename, label, solver, args.repeat)
+                for filename, label in zip(filenames, labels) for solver in args.solvers]
+        results = [job.result() for job in jobs]
+
+    write_results(results, args.output)
+
+    print("\nMaze Solving Report:")
+    for row in results:
+        print(f"{row['maze']} {row['solver']}: Path Length = {row['path_length']}, "
+              f"Median = {row['median_ms']:.3f} ms, p95 = {row['p95_ms']:.3f} ms, "
+              f"Nodes Expanded = {row['nodes_expanded']}, Peak Memory = {row['peak_kib']:.1f} KiB")
+
+if __name__ == "__main__":
+    main()
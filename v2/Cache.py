@@ -0,0 +1,72 @@
+from collections import OrderedDict
+import hashlib
+import os
+import struct
+from Grid import encode_path, decode_path
+
+# Solution cache keyed by the content of the maze.
+#
+# The key hashes the maze dimensions and cell bytes together with the
+# algorithm name and the endpoints, so the same maze loaded from any file
+# (CSV or .maze) shares its entries. Paths are stored compactly as a start
+# cell plus a 2-bit direction string (see Grid.encode_path). Recently used
+# entries are kept in memory up to capacity; with a directory, entries are
+# also written there and survive between runs.
+
+ENTRY = struct.Struct("<QQQQ")  # start, goal, moves, path length
+
+class SolutionCache:
+    def __init__(self, capacity=1024, directory=None):
+        self.capacity = capacity
+        self.directory = directory
+        self.entries = OrderedDict()
+        self.hits = self.misses = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def key(self, algorithm, maze, start, goal):
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(struct.pack("<II", maze.width, maze.height))
+        digest.update(maze.cells)
+        digest.update(f"{algorithm}:{start}:{goal}".encode())
+        return digest.hexdigest()
+
+    def _filename(self, key):
+        return os.path.join(self.directory, f"{key}.path")
+
+    def _remember(self, key, entry):
+        self.entries[key] = entry
+        self.entries.move_to_end(key)
+        if len(self.entries) > self.capacity:
+            self.entries.popitem(last=False)
+
+    # Cached (path, moves) for this query, or None
+    def get(self, algorithm, maze, start, goal):
+        key = self.key(algorithm, maze, start, goal)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self.entries.move_to_end(key)
+        elif self.directory and os.path.exists(self._filename(key)):
+            with open(self._filename(key), "rb") as file:
+                data = file.read()
+            entry = ENTRY.unpack_from(data) + (data[ENTRY.size:],)
+            self._remember(key, entry)
+        if entry is None:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        start, _, moves, length, packed = entry
+        return decode_path(maze, start, packed, length), moves
+
+    def put(self, algorithm, maze, start, goal, path, moves):
+        key = self.key(algorithm, maze, start, goal)
+        entry = (start, goal, moves, len(path), encode_path(maze, path))
+        self._remember(key, entry)
+        if self.directory:
+            # Write then rename, so readers never see a partial entry
+            filename = self._filename(key)
+            with open(f"{filename}.{os.getpid()}", "wb") as file:
+                file.write(ENTRY.pack(*entry[:4]))
+                file.write(entry[4])
+            os.replace(f"{filename}.{os.getpid()}", filename)
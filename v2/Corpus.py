@@ -0,0 +1,80 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from Generators import GENERATORS, generate
+from MazeFile import save_maze
+
+# Reproducible benchmark mazes.
+#
+#   python Corpus.py --suite standard
+#
+# Every maze is identified by (algorithm, width, height, seed) and generated
+# with its own random.Random(seed), so the same entry always yields the same
+# maze. Generated mazes are kept as .maze files in the corpus directory and
+# reused on later runs, which keeps benchmark inputs identical across code
+# changes, including changes to the generators themselves.
+
+DEFAULT_DIRECTORY = ".maze_corpus"
+
+# Named suites of (algorithm, width, height, seed)
+SUITES = {
+    "smoke": [("hunt_and_kill", size, size, 0) for size in (10, 50)],
+    "standard": [(algorithm, size, size, seed) for algorithm in GENERATORS
+                 for size in (10, 50, 100, 500) for seed in range(3)],
+    "large": [(algorithm, size, size, 0) for algorithm in ("kruskal", "eller")
+              for size in (1000, 2000)],
+}
+
+def entry_name(algorithm, width, height, seed):
+    return f"{algorithm}_{width}x{height}_{seed}.maze"
+
+# Runs in a worker: generate one entry, writing it under a temporary name
+# first so an interrupted run never leaves a partial file in the corpus
+def build_entry(filename, algorithm, width, height, seed):
+    partial = f"{filename}.{os.getpid()}"
+    save_maze(generate(algorithm, width, height, random.Random(seed)), partial)
+    os.replace(partial, filename)
+    return filename
+
+class Corpus:
+    def __init__(self, directory=DEFAULT_DIRECTORY):
+        self.directory = directory
+        os.makedirs(directory, exist_ok=True)
+
+    def filename(self, algorithm, width, height, seed):
+        return os.path.join(self.directory, entry_name(algorithm, width, height, seed))
+
+    # Filename of the entry, generating it if it is not in the corpus yet
+    def get(self, algorithm, width, height, seed):
+        filename = self.filename(algorithm, width, height, seed)
+        if not os.path.exists(filename):
+            build_entry(filename, algorithm, width, height, seed)
+        return filename
+
+    # Filenames of all the entries, generating the missing ones in parallel
+    # on pool (or in a new pool with the given number of workers)
+    def build(self, entries, pool=None, workers=None):
+        filenames = [self.filename(*entry) for entry in entries]
+        missing = [(filename, *entry) for filename, entry in zip(filenames, entries)
+                   if not os.path.exists(filename)]
+        if missing:
+            if pool is None:
+                with ProcessPoolExecutor(workers) as pool:
+                    list(pool.map(build_entry, *zip(*missing)))
+            else:
+                list(pool.map(build_entry, *zip(*missing)))
+        return filenames
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Build a reproducible maze corpus")
+    parser.add_argument("--suite", choices=list(SUITES), default="standard")
+    parser.add_argument("--directory", default=DEFAULT_DIRECTORY)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    args = parser.parse_args()
+
+    entries = SUITES[args.suite]
+    corpus = Corpus(args.directory)
+    existing = sum(os.path.exists(corpus.filename(*entry)) for entry in entries)
+    corpus.build(entries, workers=args.workers)
+    print(f"{args.suite}: {len(entries)} mazes in {args.directory} ({len(entries) - existing} generated, {existing} reused)")
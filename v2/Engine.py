@@ -0,0 +1,430 @@
+from array import array
+from collections import deque
+import heapq
+from time import perf_counter
+from Grid import Maze, DEGREE, COST, MAX_COST
+
+# Headless maze solvers. Nothing here imports pygame or prompts for input,
+# so the module can be imported by batch jobs as well as by Solve.py.
+#
+# Every solver takes a Maze (or rows of N/S/E/W bitmasks) plus optional
+# start/goal cell indices and an optional observer. Cells are plain integer
+# indices (y * width + x) and paths are returned as lists of indices. The
+# observer is called as observer(event, cell) whenever the solver expands or
+# fills a cell; if it returns a truthy value the search is abandoned and
+# (None, inf) is returned. Dijkstra, Dial and A* find the cheapest path
+# through weighted cells (see Grid.COST); the other solvers count steps only.
+# A Stats.Stats passed as stats is filled with the
+# search counters and the time spent searching and tracing the path.
+
+# Observer events
+VISIT = 0  # Cell expanded by a search
+FILL = 1  # Cell removed by Dead-End Fill
+
+def _prepare(maze, start, goal):
+    if not isinstance(maze, Maze):
+        maze = Maze.from_rows(maze)
+    if start is None:
+        start = maze.start
+    if goal is None:
+        goal = maze.goal
+    return maze, start, goal
+
+# Walk back from cell to start using the direction each cell was entered from
+def _trace_path(maze, came_from, start, cell):
+    offset = maze.offset
+    path = [cell]
+    while cell != start:
+        cell -= offset[came_from[cell]]
+        path.append(cell)
+    path.reverse()
+    return path
+
+# Trace the path to cell ([] when the goal was not reached) and, with stats,
+# record the counters and the search and path phases
+def _result(maze, came_from, start, cell, moves, stats, began, **counters):
+    if stats is not None:
+        began = stats.record("search", began, **counters)
+    path = [] if cell is None else _trace_path(maze, came_from, start, cell)
+    if stats is not None:
+        stats.record("path", began)
+    return path, moves
+
+# DFS Algorithm
+def dfs_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    visited = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    stack = [start]
+    moves = expanded = peak = 0
+    found = None
+
+    while stack:
+        if len(stack) > peak:
+            peak = len(stack)
+        i = stack.pop()
+        moves += 1
+        if visited[i]:
+            continue
+        visited[i] = 1
+        expanded += 1
+        if observer and observer(VISIT, i):
+            return None, float('inf')
+
+        if i == goal:
+            found = i
+            break
+
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            if not visited[n]:
+                stack.append(n)
+                came_from[n] = direction
+
+    # Every pop matches a push; the start was pushed without an edge
+    return _result(maze, came_from, start, found, moves, stats, began,
+                   nodes_expanded=expanded, edges_relaxed=moves + len(stack) - 1,
+                   peak_frontier=peak, stale_pops=moves - expanded)
+
+# BFS Algorithm
+def bfs_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    visited = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    visited[start] = 1
+    queue = deque([start])
+    moves = peak = 0
+    found = None
+
+    while queue:
+        if len(queue) > peak:
+            peak = len(queue)
+        i = queue.popleft()
+        moves += 1
+        if observer and observer(VISIT, i):
+            return None, float('inf')
+
+        if i == goal:
+            found = i
+            break
+
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            if not visited[n]:
+                visited[n] = 1
+                came_from[n] = direction
+                queue.append(n)
+
+    return _result(maze, came_from, start, found, moves, stats, began,
+                   nodes_expanded=moves, edges_relaxed=moves + len(queue) - 1,
+                   peak_frontier=peak)
+
+# Bidirectional BFS
+# Grows one BFS layer at a time from whichever end has the smaller frontier.
+# side[] records which search reached a cell (1 = start, 2 = goal) and
+# came_from[] the direction it was entered from, so either half of the path
+# can be traced back to its own root. Once a layer touches the other search,
+# the rest of that layer is still checked so the shortest join is kept.
+def bidirectional_bfs_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    side = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    distances = array('i', [0]) * maze.size
+    side[start], side[goal] = 1, 2
+    frontiers = {1: [start], 2: [goal]}
+    moves = relaxed = peak = 0
+    best = None
+
+    while start != goal and frontiers[1] and frontiers[2]:
+        this = 1 if len(frontiers[1]) <= len(frontiers[2]) else 2
+        other = 3 - this
+        peak = max(peak, len(frontiers[1]) + len(frontiers[2]))
+        layer = []
+        for i in frontiers[this]:
+            moves += 1
+            if observer and observer(VISIT, i):
+                return None, float('inf')
+
+            for direction, step in steps[cells[i]]:
+                n = i + step
+                if side[n] == other:
+                    length = distances[i] + distances[n]
+                    if best is None or length < best[0]:
+                        best = (length, i, n) if this == 1 else (length, n, i)
+                elif not side[n]:
+                    side[n] = this
+                    came_from[n] = direction
+                    distances[n] = distances[i] + 1
+                    layer.append(n)
+        frontiers[this] = layer
+        relaxed += len(layer)
+        if best is not None:
+            break
+
+    if stats is not None:
+        began = stats.record("search", began, nodes_expanded=moves,
+                             edges_relaxed=relaxed, peak_frontier=peak)
+    if start == goal:
+        path = [start]
+    elif best is None:
+        path = []
+    else:
+        _, i, n = best
+        path = _trace_path(maze, came_from, start, i)
+        path.extend(reversed(_trace_path(maze, came_from, goal, n)))
+    if stats is not None:
+        stats.record("path", began)
+    return path, moves
+
+# Dijkstra's Algorithm
+def dijkstra_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    visited = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    distances = array('i', [-1]) * maze.size
+    distances[start] = 0
+    pq = [(0, start)]
+    moves = expanded = peak = 0
+    found = None
+
+    while pq:
+        if len(pq) > peak:
+            peak = len(pq)
+        current_distance, i = heapq.heappop(pq)
+        moves += 1
+        if visited[i]:
+            continue
+        visited[i] = 1
+        expanded += 1
+        if observer and observer(VISIT, i):
+            return None, float('inf')
+
+        if i == goal:
+            found = i
+            break
+
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            new_distance = current_distance + COST[cells[n]]
+            if distances[n] < 0 or new_distance < distances[n]:
+                distances[n] = new_distance
+                came_from[n] = direction
+                heapq.heappush(pq, (new_distance, n))
+
+    return _result(maze, came_from, start, found, moves, stats, began,
+                   nodes_expanded=expanded, edges_relaxed=moves + len(pq) - 1,
+                   peak_frontier=peak, stale_pops=moves - expanded)
+
+# Dial's Algorithm
+# Dijkstra with a bucket queue for the small integer cell costs. Pending
+# distances never span more than MAX_COST + 1 values, so a ring of that many
+# buckets indexed by distance holds them all, and the next cell is found by
+# advancing a cursor instead of popping a heap. Entries superseded by a
+# shorter distance are skipped when their bucket comes round.
+def dial_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    visited = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    distances = array('i', [-1]) * maze.size
+    distances[start] = 0
+    ring = MAX_COST + 1
+    buckets = [[] for _ in range(ring)]
+    buckets[0].append(start)
+    pending = 1
+    distance = 0
+    moves = expanded = peak = 0
+    found = None
+
+    while pending:
+        bucket = buckets[distance % ring]
+        while not bucket:
+            distance += 1
+            bucket = buckets[distance % ring]
+        if pending > peak:
+            peak = pending
+        i = bucket.pop()
+        pending -= 1
+        moves += 1
+        if visited[i]:
+            continue
+        visited[i] = 1
+        expanded += 1
+        if observer and observer(VISIT, i):
+            return None, float('inf')
+
+        if i == goal:
+            found = i
+            break
+
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            new_distance = distance + COST[cells[n]]
+            if distances[n] < 0 or new_distance < distances[n]:
+                distances[n] = new_distance
+                came_from[n] = direction
+                buckets[new_distance % ring].append(n)
+                pending += 1
+
+    return _result(maze, came_from, start, found, moves, stats, began,
+                   nodes_expanded=expanded, edges_relaxed=moves + pending - 1,
+                   peak_frontier=peak, stale_pops=moves - expanded)
+
+# A* Search
+# Manhattan distance to the goal as the heuristic (admissible, as every cell
+# costs at least 1); ties on f = g + h are broken towards the smaller h,
+# i.e. the cell closest to the goal.
+def astar_solve(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps, w = maze.cells, maze.steps, maze.width
+    gx, gy = goal % w, goal // w
+    visited = bytearray(maze.size)
+    came_from = bytearray(maze.size)
+    distances = array('i', [-1]) * maze.size
+    distances[start] = 0
+    h = abs(start % w - gx) + abs(start // w - gy)
+    pq = [(h, h, start)]
+    moves = expanded = peak = 0
+    found = None
+
+    while pq:
+        if len(pq) > peak:
+            peak = len(pq)
+        _, _, i = heapq.heappop(pq)
+        moves += 1
+        if visited[i]:
+            continue
+        visited[i] = 1
+        expanded += 1
+        if observer and observer(VISIT, i):
+            return None, float('inf')
+
+        if i == goal:
+            found = i
+            break
+
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            new_distance = distances[i] + COST[cells[n]]
+            if distances[n] < 0 or new_distance < distances[n]:
+                distances[n] = new_distance
+                came_from[n] = direction
+                h = abs(n % w - gx) + abs(n // w - gy)
+                heapq.heappush(pq, (new_distance + h, h, n))
+
+    return _result(maze, came_from, start, found, moves, stats, began,
+                   nodes_expanded=expanded, edges_relaxed=moves + len(pq) - 1,
+                   peak_frontier=peak, stale_pops=moves - expanded)
+
+# Dead-End Fill Algorithm
+# Worklist version: every dead end (a cell with one open side) is queued once,
+# and filling it lowers its neighbor's degree, queueing the neighbor when it
+# becomes a dead end in turn. Each cell is filled at most once, so this is
+# linear in the size of the maze. Fills are tracked in separate arrays and
+# the caller's maze is left intact.
+
+def dead_end_fill(maze, start=None, goal=None, observer=None, stats=None):
+    began = perf_counter()
+    maze, start, goal = _prepare(maze, start, goal)
+    cells, steps = maze.cells, maze.steps
+    degree = bytearray(bytes(cells).translate(DEGREE))
+    filled = bytearray(maze.size)
+    moves = relaxed = 0
+
+    worklist = []
+    i = degree.find(1)
+    while i >= 0:
+        worklist.append(i)
+        i = degree.find(1, i + 1)
+    peak = len(worklist)
+
+    while worklist:
+        i = worklist.pop()
+        if i == start or i == goal:
+            continue
+        filled[i] = 1
+        moves += 1
+        if observer and observer(FILL, i):
+            return None, float('inf')
+
+        for _, step in steps[cells[i]]:
+            n = i + step
+            if not filled[n]:
+                degree[n] -= 1
+                relaxed += 1
+                if degree[n] == 1:
+                    worklist.append(n)
+                    if len(worklist) > peak:
+                        peak = len(worklist)
+
+    if stats is not None:
+        began = stats.record("fill", began, nodes_expanded=moves,
+                             edges_relaxed=relaxed, peak_frontier=peak)
+
+    # Order the cells left unfilled by walking them from start to goal
+    came_from = bytearray(maze.size)
+    filled[start] = 1
+    queue = deque([start])
+    walked = 0
+    found = None
+    while queue:
+        i = queue.popleft()
+        walked += 1
+        if i == goal:
+            found = i
+            break
+        for direction, step in steps[cells[i]]:
+            n = i + step
+            if not filled[n]:
+                filled[n] = 1
+                came_from[n] = direction
+                queue.append(n)
+
+    if stats is not None:
+        stats.nodes_expanded += walked
+    return _result(maze, came_from, start, found, moves, stats, began)
+
+# Solver registry, in the order run_solvers reports them
+SOLVERS = {
+    "Depth-First Search": dfs_solve,
+    "Breadth-First Search": bfs_solve,
+    "Bidirectional BFS": bidirectional_bfs_solve,
+    "Dijkstra's Algorithm": dijkstra_solve,
+    "Dial's Algorithm": dial_solve,
+    "A* Search": astar_solve,
+    "Dead-End Fill": dead_end_fill,
+}
+
+# Run a solver by name. With a cache (see Cache.SolutionCache) the result is
+# looked up before any search runs, unless an observer needs to see the
+# search; a cache hit only records a "cache" phase in stats. Stats with
+# memory or profile set are measured by Stats.measure.
+def solve(name, maze, start=None, goal=None, observer=None, cache=None, stats=None):
+    maze, start, goal = _prepare(maze, start, goal)
+    use_cache = cache is not None and observer is None
+    if use_cache:
+        began = perf_counter()
+        result = cache.get(name, maze, start, goal)
+        if result is not None:
+            if stats is not None:
+                stats.record("cache", began)
+            return result
+
+    if stats is None:
+        result = SOLVERS[name](maze, start, goal, observer)
+    else:
+        from Stats import measure
+        result = measure(SOLVERS[name], maze, start, goal, observer, stats=stats)
+    if use_cache:
+        cache.put(name, maze, start, goal, *result)
+    return result
@@ -0,0 +1,107 @@
+import argparse
+import struct
+import zlib
+import numpy as np
+from Grid import E, S
+from Engine import SOLVERS
+from MazeFile import load_maze
+
+# Headless PNG export. The maze is rasterized straight from the bitmask
+# grid with NumPy: on a (2h+1) x (2w+1) pixel lattice every cell sits at
+# (2y+1, 2x+1), the pixel to its right is open when the cell has an E
+# passage and the one below when it has an S passage; everything else is
+# wall. Overlays are boolean masks on the same lattice. The lattice holds
+# palette indexes, one byte per point, and is written as a palette PNG
+# without pygame, scaled up one row at a time while compressing so the
+# scaled image is never held in memory.
+
+# Constants for colors
+RED = (255, 0, 0)  # Start
+GREEN = (0, 255, 0)  # End
+BLACK = (0, 0, 0)  # Wall
+WHITE = (255, 255, 255)  # Background
+CYAN = (0, 255, 255)  # Visited cells
+MAGENTA = (255, 0, 255)  # Final Path
+
+PALETTE = (BLACK, WHITE, CYAN, MAGENTA, RED, GREEN)
+WALL, OPEN, VISITED, PATH, START, GOAL = range(len(PALETTE))
+
+MAX_SCALE = 4  # Pixels per lattice point for small mazes
+MAX_PIXELS = 1 << 24  # Larger mazes are scaled down to keep images under this size
+
+def _cell_mask(maze, cells):
+    mask = np.zeros((2 * maze.height + 1, 2 * maze.width + 1), dtype=bool)
+    ys, xs = np.divmod(np.asarray(cells, dtype=np.int64), maze.width)
+    mask[2 * ys + 1, 2 * xs + 1] = True
+    return mask
+
+# Cells of a path plus the passages joining consecutive cells
+def _path_mask(maze, path):
+    mask = _cell_mask(maze, path)
+    ys, xs = np.divmod(np.asarray(path, dtype=np.int64), maze.width)
+    mask[ys[1:] + ys[:-1] + 1, xs[1:] + xs[:-1] + 1] = True
+    return mask
+
+# The largest scale up to MAX_SCALE whose image fits in MAX_PIXELS, at least 1
+def default_scale(maze):
+    points = (2 * maze.height + 1) * (2 * maze.width + 1)
+    return max(1, min(MAX_SCALE, int((MAX_PIXELS / points) ** 0.5)))
+
+# The unscaled lattice as a uint8 array of PALETTE indexes
+def render_image(maze, path=None, visited=None):
+    grid = np.frombuffer(maze.cells, dtype=np.uint8).reshape(maze.height, maze.width)
+    image = np.full((2 * maze.height + 1, 2 * maze.width + 1), WALL, dtype=np.uint8)
+    image[1::2, 1::2] = OPEN
+    image[1::2, 2::2][(grid & E) != 0] = OPEN
+    image[2::2, 1::2][(grid & S) != 0] = OPEN
+
+    if visited is not None and len(visited):
+        image[_cell_mask(maze, visited)] = VISITED
+    if path is not None and len(path):
+        image[_path_mask(maze, path)] = PATH
+    for cell, color in ((maze.start, START), (maze.goal, GOAL)):
+        y, x = divmod(cell, maze.width)
+        image[2 * y + 1, 2 * x + 1] = color
+    return image
+
+def _chunk(kind, data):
+    chunk = struct.pack(">I", len(data)) + kind + data
+    return chunk + struct.pack(">I", zlib.crc32(kind + data))
+
+# Write a uint8 array of PALETTE indexes as a palette PNG, repeating every
+# point scale times in each direction as the rows are compressed
+def save_png(image, filename, scale=1):
+    height, width = image.shape
+    compressor = zlib.compressobj(1)
+    data = []
+    row = np.zeros(width * scale + 1, dtype=np.uint8)  # Filter byte 0
+    for line in image:
+        row[1:] = line.repeat(scale)
+        data.append(compressor.compress(row.tobytes() * scale))
+    data.append(compressor.flush())
+
+    with open(filename, "wb") as file:
+        file.write(b"\x89PNG\r\n\x1a\n")
+        file.write(_chunk(b"IHDR", struct.pack(">IIBBBBB", width * scale, height * scale, 8, 3, 0, 0, 0)))
+        file.write(_chunk(b"PLTE", bytes(c for color in PALETTE for c in color)))
+        file.write(_chunk(b"IDAT", b"".join(data)))
+        file.write(_chunk(b"IEND", b""))
+
+# scale defaults to default_scale(maze)
+def export_png(maze, filename, path=None, visited=None, scale=None):
+    if scale is None:
+        scale = default_scale(maze)
+    save_png(render_image(maze, path, visited), filename, scale)
+
+# python Export.py maze.maze --solver "Breadth-First Search" --output BFS_solve.png
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export a maze as PNG without opening a window")
+    parser.add_argument("filename")
+    parser.add_argument("--solver", choices=list(SOLVERS), help="overlay this solver's path")
+    parser.add_argument("--scale", type=int, help=f"pixels per lattice point (default: up to {MAX_SCALE}, within {MAX_PIXELS} pixels)")
+    parser.add_argument("--output", default="maze.png")
+    args = parser.parse_args()
+
+    maze = load_maze(args.filename)
+    path = SOLVERS[args.solver](maze)[0] if args.solver else None
+    export_png(maze, args.output, path, scale=args.scale)
@@ -1,8 +1,92 @@
-import pygame
+import argparse
 import random
 import sys
-import time
-import csv
+from Grid import Maze, MAX_COST, save_maze_as_csv, save_rows_as_csv
+from Generators import GENERATORS, generate, eller_rows, add_terrain, terrain_rows, braid
+from MazeFile import save_maze, save_rows
+from Stats import Stats, measure
+
+# Command line options; with --headless nothing is drawn and no prompts are shown
+parser = argparse.ArgumentParser(description="Generate a maze")
+parser.add_argument("--headless", action="store_true", help="generate without a window or prompts")
+parser.add_argument("--algorithm", choices=sorted(GENERATORS), help="default: hunt_and_kill (eller with --stream)")
+parser.add_argument("--width", type=int, default=10)
+parser.add_argument("--height", type=int, default=10)
+parser.add_argument("--filename", default="maze")
+parser.add_argument("--format", choices=["csv", "maze"], default="csv", help="output file format (maze is the compact binary format)")
+parser.add_argument("--png", action="store_true", help="also export a PNG image (headless mode, needs numpy)")
+parser.add_argument("--stream", action="store_true", help="write rows as they are generated (Eller's algorithm, headless only)")
+parser.add_argument("--tile", type=int, help="generate in tiles of this size across a process pool (headless, maze format)")
+parser.add_argument("--workers", type=int, help="processes for --tile (default: one per CPU)")
+parser.add_argument("--braid", type=float, default=0.0, metavar="FRACTION", help="remove this fraction of dead ends to add loops")
+parser.add_argument("--terrain", type=int, default=1, metavar="MAX_COST", help=f"random cell costs from 1 to MAX_COST (at most {MAX_COST}) for weighted solvers")
+parser.add_argument("--seed", type=int, help="seed for a reproducible maze (default: random)")
+parser.add_argument("--stats", action="store_true", help="print generation counters, timings and peak memory")
+parser.add_argument("--profile", action="store_true", help="print a cProfile report of the generation")
+args = parser.parse_args()
+if not 1 <= args.terrain <= MAX_COST:
+    parser.error(f"--terrain must be between 1 and {MAX_COST}")
+if not 0 <= args.braid <= 1:
+    parser.error("--braid must be between 0 and 1")
+if args.braid and (args.tile or args.stream):
+    parser.error("--braid cannot be combined with --tile or --stream")
+
+# One RNG per maze, so a seed reproduces the maze, its braiding and terrain
+rng = random.Random(args.seed)
+
+if args.tile:
+    if not args.headless or args.format != "maze" or args.stream:
+        parser.error("--tile requires --headless and --format maze")
+    if args.terrain > 1 or args.stats or args.profile or args.png:
+        parser.error("--tile cannot be combined with --terrain, --stats, --profile or --png")
+    from Tiles import generate_tiled
+    generate_tiled(f"{args.filename}.maze", args.width, args.height,
+                   args.algorithm or "hunt_and_kill", args.tile, args.workers, args.seed)
+    sys.exit()
+
+if args.stream:
+    if not args.headless or args.algorithm not in (None, "eller"):
+        parser.error("--stream requires --headless and the eller algorithm")
+    rows = eller_rows(args.width, args.height, rng)
+    if args.terrain > 1:
+        rows = terrain_rows(rows, rng, args.terrain)
+    if args.format == "maze":
+        save_rows(rows, f"{args.filename}.maze", args.width, args.height)
+    else:
+        save_rows_as_csv(rows, f"{args.filename}.csv")
+    sys.exit()
+
+# Generation statistics, printed once the maze is finished
+stats = Stats(memory=args.stats, profile=args.profile) if args.stats or args.profile else None
+
+def report(stats):
+    if stats is None:
+        return
+    print(f"Generated in {stats.total_time:.4f} seconds: Cells Examined = {stats.nodes_expanded}, "
+          f"Passages Carved = {stats.edges_relaxed}, Peak Frontier = {stats.peak_frontier}")
+    if stats.peak_memory is not None:
+        print(f"Peak Memory = {stats.peak_memory / 1024:.1f} KiB")
+    if stats.profile_stats is not None:
+        print(stats.profile_report())
+
+if args.headless:
+    maze = generate(args.algorithm or "hunt_and_kill", args.width, args.height, rng, stats=stats)
+    report(stats)
+    if args.braid:
+        braid(maze, rng, args.braid)
+    if args.terrain > 1:
+        add_terrain(maze.cells, rng, args.terrain)
+    if args.format == "maze":
+        save_maze(maze, f"{args.filename}.maze")
+    else:
+        save_maze_as_csv(maze, f"{args.filename}.csv")
+    if args.png:
+        from Export import export_png
+        export_png(maze, f"{args.filename}.png")
+    sys.exit()
+
+import pygame
+from Render import Renderer
 
 # Constants for colors
 RED = (255, 0, 0)
@@ -11,23 +95,22 @@ GREY = (128, 128, 128)
 BLACK = (0, 0, 0)
 WHITE = (255, 255, 255)
 
-# Directions and their movements
-N, S, E, W = 1, 2, 4, 8
-DX = { E: 1, W: -1, N: 0, S: 0 }
-DY = { E: 0, W: 0, N: -1, S: 1 }
-OPPOSITE = { E: W, W: E, N: S, S: N }
-
 # Prompt for default or custom settings
 use_defaults = input("Would you like to use default settings? (y/n): ").lower()
 if use_defaults == 'y' or use_defaults == '':
     filename = "maze"
     width, height = 10, 10
+    algorithm = "hunt_and_kill"
 else:
     filename = input("Enter filename for the maze: ") or "maze"
     width = int(input("Enter maze width: ") or 20)
     height = int(input("Enter maze height: ") or 20)
+    algorithm = input(f"Enter algorithm ({', '.join(GENERATORS)}) [default: hunt_and_kill]: ") or "hunt_and_kill"
+    seed = input("Enter seed [default: random]: ")
+    if seed:
+        rng = random.Random(int(seed))
 
-grid = [[0 for _ in range(width)] for _ in range(height)]
+maze = Maze(width, height)
 
 # Pygame setup
 pygame.init()
@@ -36,85 +119,35 @@ screen = pygame.display.set_mode((width * CELL_SIZE, height * CELL_SIZE))
 pygame.display.set_caption("Maze Generator")
 clock = pygame.time.Clock()
 
+renderer = Renderer(screen, maze, CELL_SIZE, clock=clock)
+
 # Draw the maze
 def draw_maze():
-    screen.fill(WHITE)
-    for y in range(height):
-        for x in range(width):
-            # Draw walls
-            if grid[y][x] & N == 0:
-                pygame.draw.line(screen, BLACK, (x * CELL_SIZE, y * CELL_SIZE), ((x + 1) * CELL_SIZE, y * CELL_SIZE), 2)
-            if grid[y][x] & S == 0:
-                pygame.draw.line(screen, BLACK, (x * CELL_SIZE, (y + 1) * CELL_SIZE), ((x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE), 2)
-            if grid[y][x] & W == 0:
-                pygame.draw.line(screen, BLACK, (x * CELL_SIZE, y * CELL_SIZE), (x * CELL_SIZE, (y + 1) * CELL_SIZE), 2)
-            if grid[y][x] & E == 0:
-                pygame.draw.line(screen, BLACK, ((x + 1) * CELL_SIZE, y * CELL_SIZE), ((x + 1) * CELL_SIZE, (y + 1) * CELL_SIZE), 2)
-            
-            # Draw start and end cells
-            if y == 0 and x == 0:
-                pygame.draw.rect(screen, RED, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-            if y == height - 1 and x == width - 1:
-                pygame.draw.rect(screen, GREEN, (x * CELL_SIZE, y * CELL_SIZE, CELL_SIZE, CELL_SIZE))
-
-    pygame.display.flip()
-
-# Hunt and Kill algorithm functions
-def walk(x, y):
-    directions = [N, S, E, W]
-    random.shuffle(directions)
-    for dir in directions:
-        nx, ny = x + DX[dir], y + DY[dir]
-        if 0 <= nx < width and 0 <= ny < height and grid[ny][nx] == 0:
-            grid[y][x] |= dir
-            grid[ny][nx] |= OPPOSITE[dir]
-            return nx, ny
-    return None
-
-def hunt():
-    for y in range(height):
-        for x in range(width):
-            if grid[y][x] == 0:
-                neighbors = []
-                if y > 0 and grid[y-1][x] != 0:
-                    neighbors.append(N)
-                if x > 0 and grid[y][x-1] != 0:
-                    neighbors.append(W)
-                if x + 1 < width and grid[y][x+1] != 0:
-                    neighbors.append(E)
-                if y + 1 < height and grid[y+1][x] != 0:
-                    neighbors.append(S)
-
-                if neighbors:
-                    dir = random.choice(neighbors)
-                    nx, ny = x + DX[dir], y + DY[dir]
-                    grid[y][x] |= dir
-                    grid[ny][nx] |= OPPOSITE[dir]
-                    return x, y
-    return None
+    renderer.draw_all({maze.start: RED, maze.goal: GREEN})
+    renderer.flush()
 
-# Main loop for generating the maze
-x, y = random.randint(0, width - 1), random.randint(0, height - 1)
-while True:
-    draw_maze()
-    pygame.event.pump()
-    time.sleep(0.0001)
+# Redraw only the walls around each carved cell so the generation can be watched
+def observer(event, cell):
+    renderer.redraw_walls(cell)
+    renderer.flush()
 
-    result = walk(x, y)
-    if result:
-        x, y = result
-    else:
-        result = hunt()
-        if result:
-            x, y = result
-        else:
-            break
-
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
+    for pg_event in pygame.event.get():
+        if pg_event.type == pygame.QUIT:
             pygame.quit()
             sys.exit()
 
+# Main loop for generating the maze
+draw_maze()
+if stats is None:
+    GENERATORS[algorithm](maze, rng, observer)
+else:
+    measure(GENERATORS[algorithm], maze, rng, observer, stats=stats)
+    report(stats)
+if args.braid:
+    braid(maze, rng, args.braid, observer)
+if args.terrain > 1:
+    add_terrain(maze.cells, rng, args.terrain)
+
 # Display the final maze
 draw_maze()
 
@@ -125,17 +158,10 @@ def save_maze_as_png(filename):
 save_maze_as_png(filename)
 
 # Export maze as CSV
-def save_maze_as_csv(filename):
-    with open(f"{filename}.csv", mode='w', newline='') as file:
-        writer = csv.writer(file)
-        writer.writerows(grid)
+save_maze_as_csv(maze, f"{filename}.csv")
 
-save_maze_as_csv(filename)
-
-# Keep the window open to display the final maze
+# Keep the window open to display the final maze, sleeping until the next event arrives
 while True:
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            pygame.quit()
-            sys.exit()
-
+    if pygame.event.wait().type == pygame.QUIT:
+        pygame.quit()
+        sys.exit()
@@ -0,0 +1,289 @@
+from array import array
+import random
+from time import perf_counter
+from Grid import Maze, N, S, E, W, COST_SHIFT, DEGREE, MAX_COST
+from UnionFind import UnionFind
+
+# Headless perfect-maze generators. Each one carves passages into an empty
+# Maze using the N/S/E/W bitmask convention and runs in (near) linear time.
+# The optional observer is called as observer(CARVE, cell) every time a
+# passage is opened into cell, which is how Gen.py animates generation, and
+# an optional Stats.Stats is filled in when generation finishes.
+
+# Observer events
+CARVE = 0
+
+# Directions that stay inside the maze from cell i
+def _neighbors(maze, i):
+    w = maze.width
+    x = i % w
+    dirs = []
+    if i >= w:
+        dirs.append(N)
+    if i + w < maze.size:
+        dirs.append(S)
+    if x < w - 1:
+        dirs.append(E)
+    if x > 0:
+        dirs.append(W)
+    return dirs
+
+# Hunt and Kill
+# The hunt phase draws from a worklist of unvisited cells next to visited
+# ones instead of scanning the grid. Every visited cell gets one walk step,
+# which pushes the unvisited neighbors it does not carve into, and entries
+# visited since are dropped when drawn. Each cell is pushed at most four
+# times, so generation is linear.
+def hunt_and_kill(maze, rng, observer=None, stats=None):
+    began = perf_counter()
+    offset = maze.offset
+    visited = bytearray(maze.size)
+    frontier = []
+    examined = 1
+
+    i = rng.randrange(maze.size)
+    visited[i] = 1
+    while True:
+        # Walk: carve into a random unvisited neighbor
+        dirs = [d for d in _neighbors(maze, i) if not visited[i + offset[d]]]
+        if dirs:
+            direction = rng.choice(dirs)
+            frontier.extend(i + offset[d] for d in dirs if d != direction)
+            i = maze.carve(i, direction)
+            visited[i] = 1
+            examined += 1
+            if observer:
+                observer(CARVE, i)
+            continue
+
+        # Hunt: a random unvisited cell next to a visited one
+        while frontier:
+            k = rng.randrange(len(frontier))
+            frontier[k], frontier[-1] = frontier[-1], frontier[k]
+            i = frontier.pop()
+            examined += 1
+            if not visited[i]:
+                break
+        else:
+            break
+        maze.carve(i, rng.choice([d for d in _neighbors(maze, i) if visited[i + offset[d]]]))
+        visited[i] = 1
+        if observer:
+            observer(CARVE, i)
+
+    if stats is not None:
+        stats.record("generate", began, nodes_expanded=examined, edges_relaxed=maze.size - 1)
+
+# Recursive Backtracker, using an explicit stack
+def backtracker(maze, rng, observer=None, stats=None):
+    began = perf_counter()
+    offset = maze.offset
+    visited = bytearray(maze.size)
+    i = rng.randrange(maze.size)
+    visited[i] = 1
+    stack = [i]
+    examined = peak = 0
+
+    while stack:
+        i = stack[-1]
+        examined += 1
+        dirs = [d for d in _neighbors(maze, i) if not visited[i + offset[d]]]
+        if not dirs:
+            stack.pop()
+            continue
+        n = maze.carve(i, rng.choice(dirs))
+        visited[n] = 1
+        stack.append(n)
+        if len(stack) > peak:
+            peak = len(stack)
+        if observer:
+            observer(CARVE, n)
+
+    if stats is not None:
+        stats.record("generate", began, nodes_expanded=examined,
+                     edges_relaxed=maze.size - 1, peak_frontier=peak)
+
+# Kruskal's Algorithm
+# Edges are encoded as cell * 2 (east wall) or cell * 2 + 1 (south wall).
+def kruskal(maze, rng, observer=None, stats=None):
+    began = perf_counter()
+    w, size, offset = maze.width, maze.size, maze.offset
+    # Edge 2i is the E passage of cell i and 2i + 1 its S passage, 4 bytes each
+    edges = array("I", (i * 2 for i in range(size) if i % w < w - 1))
+    edges.extend(i * 2 + 1 for i in range(size - w))
+    rng.shuffle(edges)
+    sets = UnionFind(size)
+
+    for edge in edges:
+        i = edge >> 1
+        direction = S if edge & 1 else E
+        if sets.union(i, i + offset[direction]):
+            n = maze.carve(i, direction)
+            if observer:
+                observer(CARVE, n)
+
+    if stats is not None:
+        stats.record("generate", began, nodes_expanded=len(edges), edges_relaxed=maze.size - 1)
+
+# Wilson's Algorithm
+# Loop-erased random walks: walk_dir remembers the last exit taken from each
+# cell, so revisiting a cell overwrites (erases) the loop through it.
+def wilson(maze, rng, observer=None, stats=None):
+    began = perf_counter()
+    offset = maze.offset
+    in_tree = bytearray(maze.size)
+    walk_dir = bytearray(maze.size)
+    in_tree[rng.randrange(maze.size)] = 1
+    remaining = maze.size - 1
+    pos = 0
+    examined = peak = 0
+
+    while remaining:
+        start = pos = in_tree.find(0, pos)
+        i = start
+        steps = 0
+        while not in_tree[i]:
+            direction = rng.choice(_neighbors(maze, i))
+            walk_dir[i] = direction
+            i += offset[direction]
+            steps += 1
+        examined += steps
+        if steps > peak:
+            peak = steps
+
+        i = start
+        while not in_tree[i]:
+            in_tree[i] = 1
+            remaining -= 1
+            n = maze.carve(i, walk_dir[i])
+            if observer:
+                observer(CARVE, i)
+            i = n
+
+    if stats is not None:
+        stats.record("generate", began, nodes_expanded=examined,
+                     edges_relaxed=maze.size - 1, peak_frontier=peak)
+
+# Eller's Algorithm
+# Works one row at a time, yielding each finished row of bitmasks before the
+# next is started, so memory stays proportional to the width only. sets[x]
+# labels the connected set of each cell in the current row and members maps
+# a label to the columns carrying it.
+def eller_rows(width, height, rng):
+    sets = [0] * width
+    north = bytearray(width)  # Passages dropped into this row from above
+    next_set = 1
+
+    for y in range(height):
+        row = bytearray(width)
+        members = {}
+        for x in range(width):
+            if north[x]:
+                row[x] |= N
+            if not sets[x]:
+                sets[x] = next_set
+                next_set += 1
+            members.setdefault(sets[x], []).append(x)
+
+        # Join neighbors in different sets; the last row joins all of them
+        last = y == height - 1
+        for x in range(width - 1):
+            a, b = sets[x], sets[x + 1]
+            if a != b and (last or rng.random() < 0.5):
+                row[x] |= E
+                row[x + 1] |= W
+                if len(members[a]) < len(members[b]):
+                    a, b = b, a
+                for k in members[b]:
+                    sets[k] = a
+                members[a].extend(members.pop(b))
+
+        # Every set drops at least one passage south into the next row
+        north = bytearray(width)
+        if not last:
+            next_sets = [0] * width
+            for label, xs in members.items():
+                forced = rng.choice(xs)
+                for x in xs:
+                    if x == forced or rng.random() < 0.5:
+                        row[x] |= S
+                        north[x] = 1
+                        next_sets[x] = label
+            sets = next_sets
+
+        yield row
+
+def eller(maze, rng, observer=None, stats=None):
+    began = perf_counter()
+    w = maze.width
+    for y, row in enumerate(eller_rows(w, maze.height, rng)):
+        maze.cells[y * w:(y + 1) * w] = row
+        if observer:
+            for x in range(w):
+                observer(CARVE, y * w + x)
+
+    if stats is not None:
+        stats.record("generate", began, nodes_expanded=maze.size, edges_relaxed=maze.size - 1)
+
+# Braiding: turn a perfect maze into one with loops by removing a fraction
+# of its dead ends. Dead ends are taken in random order and each one still
+# closed off is opened into a neighbor, preferring a neighbor that is itself
+# a dead end so one passage removes both, until enough have gone.
+def braid(maze, rng, fraction, observer=None):
+    cells, offset = maze.cells, maze.offset
+    dead_ends = []
+    degree = bytes(cells).translate(DEGREE)
+    i = degree.find(1)
+    while i >= 0:
+        dead_ends.append(i)
+        i = degree.find(1, i + 1)
+    rng.shuffle(dead_ends)
+    remaining = round(fraction * len(dead_ends))
+
+    for i in dead_ends:
+        if remaining <= 0:
+            break
+        if DEGREE[cells[i]] != 1:
+            continue
+        walls = [d for d in _neighbors(maze, i) if not cells[i] & d]
+        paired = [d for d in walls if DEGREE[cells[i + offset[d]]] == 1]
+        if not walls:
+            continue
+        n = maze.carve(i, rng.choice(paired or walls))
+        remaining -= 2 if paired else 1
+        if observer:
+            observer(CARVE, n)
+
+# Terrain weights: give every cell a random cost from 1 to max_cost, stored
+# in the high nibble of cells (a whole maze's cells or a single row)
+def add_terrain(cells, rng, max_cost):
+    if not 1 <= max_cost <= MAX_COST:
+        raise ValueError(f"max_cost must be between 1 and {MAX_COST}")
+    for i in range(len(cells)):
+        cells[i] |= rng.randrange(max_cost) << COST_SHIFT
+
+# Add terrain to rows as they are produced, e.g. by eller_rows
+def terrain_rows(rows, rng, max_cost):
+    for row in rows:
+        add_terrain(row, rng, max_cost)
+        yield row
+
+GENERATORS = {
+    "hunt_and_kill": hunt_and_kill,
+    "backtracker": backtracker,
+    "kruskal": kruskal,
+    "wilson": wilson,
+    "eller": eller,
+}
+
+# Stats with memory or profile set are measured by Stats.measure
+def generate(name, width, height, rng=None, observer=None, stats=None):
+    if rng is None:
+        rng = random.Random()
+    maze = Maze(width, height)
+    if stats is None:
+        GENERATORS[name](maze, rng, observer)
+    else:
+        from Stats import measure
+        measure(GENERATORS[name], maze, rng, observer, stats=stats)
+    return maze
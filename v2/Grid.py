@@ -0,0 +1,114 @@
+import csv
+
+# Compact maze representation shared by the generator, solvers and player.
+# Cells live in one contiguous bytearray indexed by y * width + x, each
+# holding the usual N/S/E/W bitmask of open passages in its low nibble.
+# The high nibble is an optional terrain weight: entering a cell costs
+# (cell >> COST_SHIFT) + 1, so a plain maze costs 1 per step.
+
+# Directions and their movements
+N, S, E, W = 1, 2, 4, 8
+DIRECTIONS = (N, S, E, W)
+DX = {E: 1, W: -1, N: 0, S: 0}
+DY = {E: 0, W: 0, N: -1, S: 1}
+OPPOSITE = {E: W, W: E, N: S, S: N}
+
+# Number of open sides for every cell value, for use with bytes.translate
+DEGREE = bytes(bin(mask & 0x0F).count("1") for mask in range(256))
+
+# Cost of entering a cell, for every cell value
+COST_SHIFT = 4
+MAX_COST = 16
+COST = bytes((mask >> COST_SHIFT) + 1 for mask in range(256))
+
+class Maze:
+    def __init__(self, width, height, cells=None):
+        self.width = width
+        self.height = height
+        self.size = width * height
+        self.cells = cells if cells is not None else bytearray(self.size)
+        self.start = 0
+        self.goal = self.size - 1
+
+        # Index offset for a step in each direction
+        self.offset = {N: -width, S: width, E: 1, W: -1}
+        # steps[cell] -> ((direction, offset), ...) for every open side of a cell,
+        # whatever its terrain weight
+        self.steps = [tuple((d, self.offset[d]) for d in DIRECTIONS if mask & d) for mask in range(256)]
+
+    @classmethod
+    def from_rows(cls, rows):
+        height = len(rows)
+        width = len(rows[0]) if height > 0 else 0
+        cells = bytearray(width * height)
+        for y, row in enumerate(rows):
+            cells[y * width:(y + 1) * width] = bytes(row)
+        return cls(width, height, cells)
+
+    def rows(self):
+        w = self.width
+        return [list(self.cells[y * w:(y + 1) * w]) for y in range(self.height)]
+
+    def index(self, x, y):
+        return y * self.width + x
+
+    def xy(self, i):
+        return i % self.width, i // self.width
+
+    def neighbors(self, i):
+        return [i + step for _, step in self.steps[self.cells[i]]]
+
+    # Open the wall between cell i and its neighbor in the given direction
+    def carve(self, i, direction):
+        self.cells[i] |= direction
+        self.cells[i + self.offset[direction]] |= OPPOSITE[direction]
+        return i + self.offset[direction]
+
+    def copy(self):
+        return Maze(self.width, self.height, bytearray(self.cells))
+
+# Load the CSV file
+def load_maze_from_csv(filename):
+    with open(filename, mode='r') as file:
+        reader = csv.reader(file)
+        cells = bytearray()
+        width = height = 0
+        for row in reader:
+            cells.extend(map(int, row))
+            width = len(row)
+            height += 1
+    return Maze(width, height, cells)
+
+# Export maze as CSV
+def save_maze_as_csv(maze, filename):
+    w = maze.width
+    save_rows_as_csv((maze.cells[y * w:(y + 1) * w] for y in range(maze.height)), filename)
+
+# Write rows of bitmasks as they are produced, e.g. from Generators.eller_rows
+def save_rows_as_csv(rows, filename):
+    with open(filename, mode='w', newline='') as file:
+        writer = csv.writer(file)
+        for row in rows:
+            writer.writerow(row)
+
+# Paths as direction strings: each step is a 2-bit code (N=0, S=1, E=2, W=3)
+# packed four to a byte, so a path is its start cell plus len(path) - 1 codes.
+CODE_DIRECTIONS = (N, S, E, W)
+
+def encode_path(maze, path):
+    w = maze.width
+    codes = {1: 2, -1: 3, -w: 0, w: 1}  # For width 1 the N/S entries win, as they must
+    packed = bytearray((len(path) + 2) // 4)
+    for k in range(1, len(path)):
+        packed[(k - 1) >> 2] |= codes[path[k] - path[k - 1]] << (((k - 1) & 3) * 2)
+    return bytes(packed)
+
+def decode_path(maze, start, packed, length):
+    if length == 0:
+        return []
+    offset = maze.offset
+    path = [start]
+    for k in range(length - 1):
+        start += offset[CODE_DIRECTIONS[(packed[k >> 2] >> ((k & 3) * 2)) & 3]]
+        path.append(start)
+    return path
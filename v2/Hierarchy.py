@@ -0,0 +1,158 @@
+from collections import deque
+import heapq
+from Grid import E, S
+
+# Hierarchical path queries (HPA*) for large mazes with loops.
+#
+# The maze is cut into square clusters. Every open passage that crosses a
+# cluster border is an entrance, and the cells on both sides of it are nodes
+# of a small abstract graph: an edge of cost 1 joins the two sides, and
+# nodes of the same cluster are joined by their step distance inside the
+# cluster, found once by a BFS bounded to the cluster.
+#
+# A query searches from start and goal within their own clusters to reach
+# the abstract graph, runs A* over the abstract graph only, then refines
+# each intra-cluster edge back into cells with another bounded BFS. Every
+# crossing passage is a node, so abstract distances are exact and the paths
+# found are shortest paths (counting steps), while a query touches only two
+# or three clusters' worth of cells plus the abstract nodes.
+
+DEFAULT_CLUSTER = 16
+
+class HierarchicalIndex:
+    def __init__(self, maze, cluster=DEFAULT_CLUSTER):
+        self.maze = maze
+        self.cluster = cluster
+        self.columns = -(-maze.width // cluster)
+        self.entrances = {}  # Cluster -> its abstract nodes
+        self.edges = {}  # Abstract node -> [(node, cost), ...]
+
+        w, h, cells = maze.width, maze.height, maze.cells
+        for x in range(cluster - 1, w - 1, cluster):
+            for y in range(h):
+                if cells[y * w + x] & E:
+                    self._link(y * w + x, y * w + x + 1)
+        for y in range(cluster - 1, h - 1, cluster):
+            for x in range(w):
+                if cells[y * w + x] & S:
+                    self._link(y * w + x, y * w + x + w)
+
+        for nodes in self.entrances.values():
+            for node in nodes:
+                distances, _, _ = self._search(node)
+                self.edges[node].extend((other, distances[other]) for other in nodes
+                                        if other != node and other in distances)
+
+    def _link(self, a, b):
+        for i in (a, b):
+            if i not in self.edges:
+                self.edges[i] = []
+                self.entrances.setdefault(self.cluster_of(i), []).append(i)
+        self.edges[a].append((b, 1))
+        self.edges[b].append((a, 1))
+
+    def cluster_of(self, i):
+        w, c = self.maze.width, self.cluster
+        return (i // w // c) * self.columns + i % w // c
+
+    # BFS from source bounded to its cluster, stopping early at target.
+    # Returns distances and came_from (both dicts) and the cells expanded.
+    def _search(self, source, target=None):
+        maze, cluster = self.maze, self.cluster_of(source)
+        cells, steps = maze.cells, maze.steps
+        distances = {source: 0}
+        came_from = {source: None}
+        queue = deque([source])
+        expanded = 0
+        nodes = self.edges
+        while queue:
+            i = queue.popleft()
+            expanded += 1
+            if i == target:
+                break
+            # Only a node's passages can lead out of the cluster
+            border = i in nodes
+            for _, step in steps[cells[i]]:
+                n = i + step
+                if n not in distances and (not border or self.cluster_of(n) == cluster):
+                    distances[n] = distances[i] + 1
+                    came_from[n] = i
+                    queue.append(n)
+        return distances, came_from, expanded
+
+    # Cells from came_from's root to cell
+    @staticmethod
+    def _trace(came_from, cell):
+        path = []
+        while cell is not None:
+            path.append(cell)
+            cell = came_from[cell]
+        path.reverse()
+        return path
+
+    # Shortest path as (cells, moves), where moves counts the cells expanded
+    # by the local searches plus the abstract nodes expanded
+    def solve(self, start=None, goal=None):
+        maze = self.maze
+        if start is None:
+            start = maze.start
+        if goal is None:
+            goal = maze.goal
+        w = maze.width
+        gx, gy = goal % w, goal // w
+
+        start_distances, start_came_from, moves = self._search(start)
+        goal_distances, goal_came_from, expanded = self._search(goal)
+        moves += expanded
+
+        # A path that never leaves the shared cluster, if there is one
+        best = start_distances.get(goal)
+        best_node = None
+
+        # A* over the abstract graph, entered from start's cluster and left
+        # through any node that reaches goal inside goal's cluster
+        distances = {}
+        came_from = {}
+        pq = []
+        for node in self.entrances.get(self.cluster_of(start), ()):
+            if node in start_distances:
+                distances[node] = start_distances[node]
+                came_from[node] = None
+                h = abs(node % w - gx) + abs(node // w - gy)
+                heapq.heappush(pq, (distances[node] + h, node))
+        done = set()
+        while pq:
+            f, node = heapq.heappop(pq)
+            if best is not None and f >= best:
+                break
+            if node in done:
+                continue
+            done.add(node)
+            moves += 1
+            g = distances[node]
+            if node in goal_distances and (best is None or g + goal_distances[node] < best):
+                best = g + goal_distances[node]
+                best_node = node
+            for other, cost in self.edges[node]:
+                if other not in distances or g + cost < distances[other]:
+                    distances[other] = g + cost
+                    came_from[other] = node
+                    h = abs(other % w - gx) + abs(other // w - gy)
+                    heapq.heappush(pq, (g + cost + h, other))
+
+        if best is None:
+            return [], moves
+        if best_node is None:
+            return self._trace(start_came_from, goal), moves
+
+        # Refine: start to the first node, each abstract edge, last node to goal
+        nodes = self._trace(came_from, best_node)
+        path = self._trace(start_came_from, nodes[0])
+        for a, b in zip(nodes, nodes[1:]):
+            if self.cluster_of(a) != self.cluster_of(b):
+                path.append(b)
+            else:
+                _, local, _ = self._search(a, b)
+                path.extend(self._trace(local, b)[1:])
+        path.extend(reversed(self._trace(goal_came_from, nodes[-1])[:-1]))
+        return path, moves
@@ -0,0 +1,98 @@
+from array import array
+from collections import deque
+from Grid import DEGREE
+
+# Path queries between any two cells of a perfect maze.
+#
+# A perfect maze is a spanning tree, so after one O(n) pass that roots the
+# tree and records each cell's depth and parent, the distance between any
+# two cells is depth[a] + depth[b] - 2 * depth[lca(a, b)] and the path is
+# the climb from both cells up to their lowest common ancestor.
+#
+# The LCA uses skew-binary jump pointers: every cell stores one jump to an
+# ancestor whose depth depends only on its own depth. That answers level
+# ancestor and LCA queries in O(log n) like binary lifting, but with a
+# single extra array instead of log n of them.
+
+class TreeIndex:
+    def __init__(self, maze, root=None):
+        if root is None:
+            root = maze.start
+        self.maze = maze
+        self.root = root
+        size = maze.size
+        cells, steps = maze.cells, maze.steps
+
+        if sum(bytes(cells).translate(DEGREE)) != 2 * (size - 1):
+            raise ValueError("maze is not a perfect maze")
+
+        self.came_from = came_from = bytearray(size)
+        self.depth = depth = array('i', [-1]) * size
+        self.jump = jump = array('i', [0]) * size
+        depth[root] = 0
+        jump[root] = root
+
+        # BFS visits parents before children, so jumps can be filled in order
+        reached = 1
+        queue = deque([root])
+        while queue:
+            p = queue.popleft()
+            jp = jump[p]
+            if depth[p] - depth[jp] == depth[jp] - depth[jump[jp]]:
+                child_jump = jump[jp]
+            else:
+                child_jump = p
+            for direction, step in steps[cells[p]]:
+                n = p + step
+                if depth[n] < 0:
+                    depth[n] = depth[p] + 1
+                    came_from[n] = direction
+                    jump[n] = child_jump
+                    reached += 1
+                    queue.append(n)
+
+        if reached != size:
+            raise ValueError("maze is not a perfect maze")
+
+    def parent(self, i):
+        return i - self.maze.offset[self.came_from[i]]
+
+    # Ancestor of i at the given depth
+    def ancestor(self, i, target_depth):
+        depth, jump = self.depth, self.jump
+        while depth[i] > target_depth:
+            if depth[jump[i]] >= target_depth:
+                i = jump[i]
+            else:
+                i = self.parent(i)
+        return i
+
+    def lca(self, a, b):
+        depth, jump = self.depth, self.jump
+        if depth[a] < depth[b]:
+            a, b = b, a
+        a = self.ancestor(a, depth[b])
+        while a != b:
+            # Equal depths have equal jump depths, so both sides move together
+            if jump[a] != jump[b]:
+                a, b = jump[a], jump[b]
+            else:
+                a, b = self.parent(a), self.parent(b)
+        return a
+
+    def distance(self, a, b):
+        return self.depth[a] + self.depth[b] - 2 * self.depth[self.lca(a, b)]
+
+    # Cells from a to b, inclusive
+    def path(self, a, b):
+        top = self.lca(a, b)
+        up = [a]
+        while a != top:
+            a = self.parent(a)
+            up.append(a)
+        down = []
+        while b != top:
+            down.append(b)
+            b = self.parent(b)
+        down.reverse()
+        return up + down
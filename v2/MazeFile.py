@@ -0,0 +1,113 @@
+import mmap
+import os
+import struct
+import sys
+from Grid import Maze, load_maze_from_csv
+
+# Binary maze file format (.maze)
+#
+#   magic    4 bytes  b"MAZE"
+#   version  u8
+#   packing  u8       1 = one cell per byte, 2 = two cells per byte (nibbles)
+#   reserved u16
+#   width    u32
+#   height   u32
+#   start    u64      cell index
+#   goal     u64      cell index
+#
+# followed by the cells in row-major order. Byte-packed files are opened
+# through mmap so the Maze reads its cells straight from the page cache;
+# nibble-packed files are half the size but are unpacked on load.
+
+MAGIC = b"MAZE"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHIIQQ")
+BYTE_PACKED, NIBBLE_PACKED = 1, 2
+
+_LOW = bytes(b & 0x0F for b in range(256))
+_HIGH = bytes(b >> 4 for b in range(256))
+_SHIFT = bytes((b << 4) & 0xFF for b in range(256))
+
+def _pack_nibbles(cells):
+    low = bytes(cells[0::2])
+    high = bytes(cells[1::2]).translate(_SHIFT).ljust(len(low), b"\0")
+    packed = int.from_bytes(low, "little") | int.from_bytes(high, "little")
+    return packed.to_bytes(len(low), "little")
+
+def _unpack_nibbles(data, size):
+    cells = bytearray(len(data) * 2)
+    cells[0::2] = data.translate(_LOW)
+    cells[1::2] = data.translate(_HIGH)
+    del cells[size:]
+    return cells
+
+def write_header(file, width, height, start=0, goal=None, packing=BYTE_PACKED):
+    if goal is None:
+        goal = width * height - 1
+    file.write(HEADER.pack(MAGIC, VERSION, packing, 0, width, height, start, goal))
+
+def read_header(data):
+    magic, version, packing, _, width, height, start, goal = HEADER.unpack_from(data)
+    if magic != MAGIC:
+        raise ValueError("not a maze file")
+    if version != VERSION:
+        raise ValueError(f"unsupported maze file version {version}")
+    if packing not in (BYTE_PACKED, NIBBLE_PACKED):
+        raise ValueError(f"unknown cell packing {packing}")
+    return width, height, start, goal, packing
+
+# Export maze in the binary format
+# (terrain weights live in the high nibble, so weighted mazes must be byte-packed)
+def save_maze(maze, filename, packing=BYTE_PACKED):
+    if packing == NIBBLE_PACKED and maze.size and max(maze.cells) > 0x0F:
+        raise ValueError("weighted cells do not fit in a nibble; use byte packing")
+    with open(filename, "wb") as file:
+        write_header(file, maze.width, maze.height, maze.start, maze.goal, packing)
+        if packing == NIBBLE_PACKED:
+            file.write(_pack_nibbles(maze.cells))
+        else:
+            file.write(maze.cells)
+
+# Write byte-packed rows as they are produced, e.g. from Generators.eller_rows
+def save_rows(rows, filename, width, height):
+    with open(filename, "wb") as file:
+        write_header(file, width, height)
+        for row in rows:
+            file.write(row)
+
+# Open a binary maze; byte-packed cells are a zero-copy view of the mapped file
+def open_maze(filename, writable=False):
+    with open(filename, "r+b" if writable else "rb") as file:
+        data = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_WRITE if writable else mmap.ACCESS_READ)
+    width, height, start, goal, packing = read_header(data)
+    size = width * height
+    if packing == NIBBLE_PACKED:
+        cells = _unpack_nibbles(data[HEADER.size:HEADER.size + (size + 1) // 2], size)
+        data.close()
+    else:
+        cells = memoryview(data)[HEADER.size:HEADER.size + size]
+    maze = Maze(width, height, cells)
+    maze.start, maze.goal = start, goal
+    return maze
+
+# Write back and unmap a maze opened with open_maze; nibble-packed mazes
+# were unpacked into memory and have nothing to release
+def close_maze(maze):
+    if isinstance(maze.cells, memoryview):
+        data = maze.cells.obj
+        maze.cells.release()
+        data.flush()
+        data.close()
+
+# Load either format, going by the file extension
+def load_maze(filename):
+    if filename.lower().endswith(".csv"):
+        return load_maze_from_csv(filename)
+    return open_maze(filename)
+
+# Convert CSV mazes to the binary format: python MazeFile.py maze.csv [...]
+if __name__ == "__main__":
+    for csv_name in sys.argv[1:]:
+        maze_name = os.path.splitext(csv_name)[0] + ".maze"
+        save_maze(load_maze_from_csv(csv_name), maze_name)
+        print(f"{csv_name} -> {maze_name}")
@@ -0,0 +1,101 @@
+import pygame
+from Grid import N, S, E, W
+
+# Incremental maze renderer shared by Gen.py, Solve.py and Play.py.
+#
+# The walls are drawn once onto a transparent layer. Painting a cell fills
+# its square on the screen and blits the matching piece of the wall layer
+# back over it, and only the rectangles touched since the last flush() are
+# sent to the display. flush() also ticks the clock to cap the frame rate.
+
+BLACK = (0, 0, 0)  # Wall
+WHITE = (255, 255, 255)  # Background
+TRANSPARENT = (0, 0, 0, 0)
+
+class Renderer:
+    def __init__(self, screen, maze, cell_size, top=0, clock=None, fps=0):
+        self.screen = screen
+        self.maze = maze
+        self.cell_size = cell_size
+        self.top = top
+        self.clock = clock
+        self.fps = fps
+        self.area = pygame.Rect(0, top, maze.width * cell_size, maze.height * cell_size)
+        self.colors = {}  # Cells painted something other than the background
+        self.dirty = []
+
+        self.walls = pygame.Surface(screen.get_size(), pygame.SRCALPHA)
+        self.walls.fill(TRANSPARENT)
+        for i in range(maze.size):
+            self._draw_walls(i)
+
+    def rect(self, i):
+        x, y = self.maze.xy(i)
+        return pygame.Rect(x * self.cell_size, y * self.cell_size + self.top, self.cell_size, self.cell_size)
+
+    def _draw_walls(self, i):
+        cell = self.maze.cells[i]
+        left, top = self.rect(i).topleft
+        right, bottom = left + self.cell_size, top + self.cell_size
+        if cell & N == 0:
+            pygame.draw.line(self.walls, BLACK, (left, top), (right, top), 2)
+        if cell & S == 0:
+            pygame.draw.line(self.walls, BLACK, (left, bottom), (right, bottom), 2)
+        if cell & W == 0:
+            pygame.draw.line(self.walls, BLACK, (left, top), (left, bottom), 2)
+        if cell & E == 0:
+            pygame.draw.line(self.walls, BLACK, (right, top), (right, bottom), 2)
+
+    # Repaint everything: background, the given {cell: color} map and walls
+    def draw_all(self, colors=None):
+        self.colors = dict(colors or {})
+        self.screen.fill(WHITE, self.area)
+        for i, color in self.colors.items():
+            self.screen.fill(color, self.rect(i))
+        self.screen.blit(self.walls, self.area, self.area)
+        self.dirty.append(self.area)
+
+    def paint(self, i, color=WHITE):
+        if self.colors.get(i, WHITE) == color:
+            return
+        if color == WHITE:
+            del self.colors[i]
+        else:
+            self.colors[i] = color
+        rect = self.rect(i)
+        self.screen.fill(color, rect)
+        self.screen.blit(self.walls, rect, rect)
+        self.dirty.append(rect)
+
+    # Rebuild the wall layer around cell i after its passages changed
+    def redraw_walls(self, i):
+        rect = self.rect(i).inflate(4, 4)
+        w = self.maze.width
+        x, y = self.maze.xy(i)
+        self.walls.set_clip(rect)
+        self.walls.fill(TRANSPARENT)
+        for ny in range(max(y - 1, 0), min(y + 2, self.maze.height)):
+            for nx in range(max(x - 1, 0), min(x + 2, w)):
+                self._draw_walls(ny * w + nx)
+        self.walls.set_clip(None)
+
+        rect = rect.clip(self.area)
+        self.screen.fill(WHITE, rect)
+        for ny in range(max(y - 1, 0), min(y + 2, self.maze.height)):
+            for nx in range(max(x - 1, 0), min(x + 2, w)):
+                n = ny * w + nx
+                if n in self.colors:
+                    self.screen.fill(self.colors[n], self.rect(n).clip(rect))
+        self.screen.blit(self.walls, rect, rect)
+        self.dirty.append(rect)
+
+    # Queue an area drawn by the caller (e.g. a status bar) for the next flush
+    def mark(self, rect):
+        self.dirty.append(pygame.Rect(rect))
+
+    def flush(self):
+        if self.dirty:
+            pygame.display.update(self.dirty)
+            self.dirty = []
+        if self.clock:
+            self.clock.tick(self.fps)
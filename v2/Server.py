@@ -0,0 +1,226 @@
+import argparse
+import asyncio
+import base64
+import json
+import os
+import random
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from Cache import SolutionCache
+from Engine import SOLVERS, solve
+from Generators import GENERATORS, generate
+from Grid import Maze, N, S, E, W
+
+# Maze generation and solving as a local service.
+#
+#   python Server.py --port 8765 --workers 4
+#
+# The protocol is line-delimited JSON over TCP. Each request line is an
+# object with an "op" and an optional "id" that is echoed in the response:
+#
+#   {"id": 1, "op": "generate", "algorithm": "kruskal", "width": 50, "height": 50, "seed": 7}
+#   -> {"id": 1, "width": 50, "height": 50, "start": 0, "goal": 2499, "cells": "<base64>"}
+#   {"id": 2, "op": "solve", "solver": "A* Search", "width": 50, "height": 50, "cells": "<base64>"}
+#   -> {"id": 2, "path": [0, 1, ...], "moves": 812}
+#
+# Cells are the raw N/S/E/W bitmask bytes, row by row. Failed requests get
+# {"id": ..., "error": "..."}. Responses on a connection come back in
+# completion order, so clients that pipeline requests should set ids.
+#
+# Work runs in a process pool. Requests wait in one bounded queue; each
+# dispatcher takes everything already waiting (up to the batch size) and
+# sends it to a worker as a single job, which amortises the inter-process
+# round trip under load without delaying requests when the server is idle.
+# When the queue is full, requests are refused with a "busy" error instead
+# of queueing without bound, and each connection has a limit on requests in
+# flight, past which the server stops reading from it.
+
+QUEUE_SIZE = 256       # Requests waiting for a worker
+BATCH_SIZE = 16        # Requests per worker job
+PER_CONNECTION = 64    # Requests in flight per connection
+MAX_CELLS = 4096 * 4096  # Largest maze generated or solved
+LINE_LIMIT = MAX_CELLS * 4 // 3 + 4096  # Longest request line: base64 cells plus the rest
+
+_cache = SolutionCache()  # Per worker process
+
+def _check_size(width, height):
+    if not (isinstance(width, int) and isinstance(height, int) and width > 0 and height > 0):
+        raise ValueError("width and height must be positive integers")
+    if width * height > MAX_CELLS:
+        raise ValueError(f"mazes are limited to {MAX_CELLS} cells")
+
+# The client's maze, refusing passages that open off the edge of the grid,
+# which the solvers would follow into the wrong cells
+def _maze(request):
+    _check_size(request["width"], request["height"])
+    maze = Maze(request["width"], request["height"], bytearray(base64.b64decode(request["cells"])))
+    if len(maze.cells) != maze.size:
+        raise ValueError("cells do not match width and height")
+    w, cells = maze.width, maze.cells
+    if (any(c & N for c in cells[:w]) or any(c & S for c in cells[-w:])
+            or any(c & W for c in cells[::w]) or any(c & E for c in cells[w - 1::w])):
+        raise ValueError("cells have passages leading off the grid")
+    return maze
+
+def _generate(request):
+    algorithm = request.get("algorithm", "hunt_and_kill")
+    if algorithm not in GENERATORS:
+        raise ValueError(f"unknown algorithm {algorithm!r}")
+    _check_size(request["width"], request["height"])
+    maze = generate(algorithm, request["width"], request["height"], random.Random(request.get("seed")))
+    return {"width": maze.width, "height": maze.height, "start": maze.start, "goal": maze.goal,
+            "cells": base64.b64encode(maze.cells).decode()}
+
+def _solve(request):
+    solver = request.get("solver", "Breadth-First Search")
+    if solver not in SOLVERS:
+        raise ValueError(f"unknown solver {solver!r}")
+    maze = _maze(request)
+    start, goal = request.get("start"), request.get("goal")
+    for name, cell in (("start", start), ("goal", goal)):
+        # Negative or bool cells would index the grid without complaint
+        if cell is not None and not (type(cell) is int and 0 <= cell < maze.size):
+            raise ValueError(f"{name} must be a cell index below {maze.size}")
+    path, moves = solve(solver, maze, start, goal, cache=_cache)
+    return {"path": path, "moves": moves}
+
+OPERATIONS = {"generate": _generate, "solve": _solve}
+
+# Runs in a worker process; one failing request does not fail the batch
+def run_batch(requests):
+    results = []
+    for request in requests:
+        try:
+            results.append(OPERATIONS[request["op"]](request))
+        except Exception as error:
+            results.append({"error": f"{type(error).__name__}: {error}"})
+    return results
+
+class MazeServer:
+    def __init__(self, workers=None, queue_size=QUEUE_SIZE, batch_size=BATCH_SIZE, per_connection=PER_CONNECTION):
+        self.workers = workers or os.cpu_count()
+        self.batch_size = batch_size
+        self.per_connection = per_connection
+        self.queue = asyncio.Queue(queue_size)
+        self.pool = ProcessPoolExecutor(self.workers)
+
+    async def serve(self, host, port):
+        # One dispatcher per worker keeps every worker busy with a batch
+        dispatchers = [asyncio.create_task(self.dispatch()) for _ in range(self.workers)]
+        server = await asyncio.start_server(self.handle, host, port, limit=LINE_LIMIT)
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            for dispatcher in dispatchers:
+                dispatcher.cancel()
+            self.pool.shutdown(cancel_futures=True)
+
+    async def dispatch(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            while len(batch) < self.batch_size and not self.queue.empty():
+                batch.append(self.queue.get_nowait())
+            pool = self.pool
+            try:
+                results = await loop.run_in_executor(pool, run_batch, [request for request, _ in batch])
+            except BrokenProcessPool as error:
+                # A worker died (out of memory, say): the batches in flight
+                # fail and later ones go to a fresh pool
+                self.replace_pool(pool)
+                results = [{"error": f"{type(error).__name__}: {error}"}] * len(batch)
+            except Exception as error:
+                results = [{"error": f"{type(error).__name__}: {error}"}] * len(batch)
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
+
+    # Swap out a broken pool, unless another dispatcher already has
+    def replace_pool(self, broken):
+        if self.pool is broken:
+            self.pool = ProcessPoolExecutor(self.workers)
+            broken.shutdown(wait=False, cancel_futures=True)
+
+    async def handle(self, reader, writer):
+        in_flight = asyncio.Semaphore(self.per_connection)
+        pending = set()
+        try:
+            while (line := await self.read_request(reader)) != b"":
+                if line is None:
+                    writer.write(json.dumps({"error": "request too large"}).encode() + b"\n")
+                    await writer.drain()
+                    continue
+                if not line.strip():
+                    continue
+                await in_flight.acquire()
+                task = asyncio.create_task(self.respond(line, writer, in_flight))
+                pending.add(task)
+                task.add_done_callback(pending.discard)
+            if pending:
+                await asyncio.gather(*pending)
+        except ConnectionError:
+            pass
+        finally:
+            for task in pending:
+                task.cancel()
+            writer.close()
+
+    # The next request line, b"" at the end of input, or None for a line over
+    # the limit, which is skipped so the following requests still line up
+    async def read_request(self, reader):
+        try:
+            return await reader.readuntil(b"\n")
+        except asyncio.IncompleteReadError as error:
+            return error.partial
+        except asyncio.LimitOverrunError:
+            pass
+        while True:
+            try:
+                await reader.readuntil(b"\n")
+                return None
+            except asyncio.LimitOverrunError as error:
+                await reader.readexactly(error.consumed)
+            except asyncio.IncompleteReadError:
+                return None
+
+    async def respond(self, line, writer, in_flight):
+        try:
+            result = await self.submit(line)
+            writer.write(json.dumps(result).encode() + b"\n")
+            await writer.drain()
+        finally:
+            in_flight.release()
+
+    async def submit(self, line):
+        try:
+            request = json.loads(line)
+        except ValueError:
+            return {"error": "invalid JSON"}
+        if not isinstance(request, dict):
+            return {"error": "request must be a JSON object"}
+        reply = {"id": request["id"]} if "id" in request else {}
+        if request.get("op") not in OPERATIONS:
+            return {**reply, "error": f"unknown op {request.get('op')!r}"}
+
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((request, future))
+        except asyncio.QueueFull:
+            return {**reply, "error": "busy"}
+        return {**reply, **await future}
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve maze generation and solving over TCP")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--queue", type=int, default=QUEUE_SIZE, help="requests waiting before new ones are refused")
+    parser.add_argument("--batch", type=int, default=BATCH_SIZE, help="requests sent to a worker at once")
+    args = parser.parse_args()
+
+    server = MazeServer(args.workers, args.queue, args.batch)
+    try:
+        asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,102 @@
+import cProfile
+import io
+import pstats
+from time import perf_counter
+import tracemalloc
+
+# Instrumentation shared by the solvers and generators.
+#
+# Pass a Stats as stats= to any Engine solver or Generators generator and it
+# is filled in when the run finishes. The counters mean the same thing for
+# every solver:
+#
+#   nodes_expanded  cells whose neighbors were examined, each counted once
+#                   (filled cells plus the final walk for Dead-End Fill)
+#   edges_relaxed   neighbors discovered or improved through an open passage
+#                   (degree decrements for Dead-End Fill)
+#   peak_frontier   largest stack, queue, heap or worklist during the run
+#   stale_pops      entries popped for cells that were already expanded
+#
+# For generators nodes_expanded counts cells examined (walk steps, hunt
+# candidates, stack iterations or edges tried), edges_relaxed counts the
+# passages carved (size - 1 for a perfect maze) and peak_frontier the
+# longest stack or random walk.
+#
+# phases maps a phase name ("search", "path", "generate", ...) to seconds of
+# perf_counter time. Memory tracing and profiling slow the run down, so they
+# only happen through measure() and only when enabled.
+
+COUNTERS = ("nodes_expanded", "edges_relaxed", "peak_frontier", "stale_pops")
+
+class Stats:
+    def __init__(self, memory=False, profile=False):
+        self.memory = memory
+        self.profile = profile
+        self.nodes_expanded = 0
+        self.edges_relaxed = 0
+        self.peak_frontier = 0
+        self.stale_pops = 0
+        self.phases = {}
+        self.peak_memory = None  # Bytes, when memory tracing was on
+        self.profile_stats = None  # pstats.Stats, when profiling was on
+
+    # Add the time since began to a phase and the given counters to the
+    # totals (peak_frontier keeps the maximum); returns the current time so
+    # the next phase can start from it
+    def record(self, phase, began, **counters):
+        now = perf_counter()
+        self.phases[phase] = self.phases.get(phase, 0.0) + now - began
+        for name, value in counters.items():
+            if name == "peak_frontier":
+                self.peak_frontier = max(self.peak_frontier, value)
+            else:
+                setattr(self, name, getattr(self, name) + value)
+        return now
+
+    @property
+    def total_time(self):
+        return sum(self.phases.values())
+
+    def as_dict(self):
+        result = {name: getattr(self, name) for name in COUNTERS}
+        result["phases"] = dict(self.phases)
+        result["peak_memory"] = self.peak_memory
+        return result
+
+    # Top functions by cumulative time, when profiling was on
+    def profile_report(self, limit=20):
+        if self.profile_stats is None:
+            return ""
+        out = io.StringIO()
+        self.profile_stats.stream = out
+        self.profile_stats.sort_stats("cumulative").print_stats(limit)
+        return out.getvalue()
+
+    def __repr__(self):
+        counters = ", ".join(f"{name}={getattr(self, name)}" for name in COUNTERS)
+        phases = ", ".join(f"{name}={seconds:.6f}s" for name, seconds in self.phases.items())
+        return f"Stats({counters}, phases: {phases or 'none'})"
+
+# Call function(*args, stats=stats, **kwargs), tracing memory and profiling
+# around it when the stats ask for it
+def measure(function, *args, stats, **kwargs):
+    tracing = stats.memory and not tracemalloc.is_tracing()
+    if tracing:
+        tracemalloc.start()
+    elif stats.memory:
+        tracemalloc.reset_peak()
+    profiler = cProfile.Profile() if stats.profile else None
+    try:
+        if profiler:
+            profiler.enable()
+        try:
+            return function(*args, stats=stats, **kwargs)
+        finally:
+            if profiler:
+                profiler.disable()
+                stats.profile_stats = pstats.Stats(profiler)
+            if stats.memory:
+                stats.peak_memory = tracemalloc.get_traced_memory()[1]
+    finally:
+        if tracing:
+            tracemalloc.stop()
@@ -0,0 +1,94 @@
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+import os
+import random
+from Generators import GENERATORS, generate
+from Grid import E, S
+from MazeFile import HEADER, close_maze, open_maze, write_header
+from UnionFind import UnionFind
+
+# Tiled generation of mazes too large for one process.
+#
+#   python Tiles.py --width 100000 --height 100000 --tile 2048 --filename huge
+#
+# The output .maze file is created at full size up front (sparse where the
+# filesystem allows) and every tile is generated as an independent perfect
+# maze in a worker process, which maps the file and writes its rows in
+# place. The tiles are then stitched together by a random spanning tree over
+# the tile grid: each tree edge opens one wall at a random point of the
+# border between two tiles. A spanning tree of spanning trees joined by
+# single passages is itself a spanning tree, so the result is still a
+# perfect maze.
+
+DEFAULT_TILE = 1024
+
+def create_maze_file(filename, width, height):
+    with open(filename, "wb") as file:
+        write_header(file, width, height)
+        file.truncate(HEADER.size + width * height)
+
+# Tiles in row-major order as (x, y, width, height)
+def tile_layout(width, height, tile):
+    return [(x, y, min(tile, width - x), min(tile, height - y))
+            for y in range(0, height, tile) for x in range(0, width, tile)]
+
+# Runs in a worker: generate one tile and copy it into the shared file
+def generate_tile(filename, algorithm, x, y, tile_width, tile_height, seed):
+    tile = generate(algorithm, tile_width, tile_height, random.Random(seed))
+    maze = open_maze(filename, writable=True)
+    w = maze.width
+    for row in range(tile_height):
+        start = (y + row) * w + x
+        maze.cells[start:start + tile_width] = tile.cells[row * tile_width:(row + 1) * tile_width]
+    close_maze(maze)
+
+# Open one wall along the border of every edge of a random spanning tree
+# over the tile grid
+def stitch_tiles(maze, tile, rng):
+    w, h = maze.width, maze.height
+    columns, rows = -(-w // tile), -(-h // tile)
+    edges = [(t, E) for t in range(columns * rows) if t % columns < columns - 1]
+    edges.extend((t, S) for t in range(columns * rows - columns))
+    rng.shuffle(edges)
+    tiles = UnionFind(columns * rows)
+
+    for t, direction in edges:
+        tx, ty = t % columns, t // columns
+        if direction == E:
+            if not tiles.union(t, t + 1):
+                continue
+            x = (tx + 1) * tile - 1
+            y = rng.randrange(ty * tile, min((ty + 1) * tile, h))
+        else:
+            if not tiles.union(t, t + columns):
+                continue
+            x = rng.randrange(tx * tile, min((tx + 1) * tile, w))
+            y = (ty + 1) * tile - 1
+        maze.carve(y * w + x, direction)
+
+def generate_tiled(filename, width, height, algorithm="hunt_and_kill", tile=DEFAULT_TILE, workers=None, seed=None):
+    create_maze_file(filename, width, height)
+
+    with ProcessPoolExecutor(workers) as pool:
+        jobs = [pool.submit(generate_tile, filename, algorithm, x, y, tile_width, tile_height,
+                            None if seed is None else f"{seed}/{n}")
+                for n, (x, y, tile_width, tile_height) in enumerate(tile_layout(width, height, tile))]
+        for job in jobs:
+            job.result()
+
+    maze = open_maze(filename, writable=True)
+    stitch_tiles(maze, tile, random.Random(None if seed is None else f"{seed}/stitch"))
+    close_maze(maze)
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate a large maze in parallel tiles")
+    parser.add_argument("--width", type=int, required=True)
+    parser.add_argument("--height", type=int, required=True)
+    parser.add_argument("--tile", type=int, default=DEFAULT_TILE, help="tile side in cells")
+    parser.add_argument("--algorithm", choices=sorted(GENERATORS), default="hunt_and_kill")
+    parser.add_argument("--workers", type=int, default=os.cpu_count())
+    parser.add_argument("--seed", type=int)
+    parser.add_argument("--filename", default="maze")
+    args = parser.parse_args()
+
+    generate_tiled(f"{args.filename}.maze", args.width, args.height, args.algorithm, args.tile, args.workers, args.seed)
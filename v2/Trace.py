@@ -0,0 +1,170 @@
+import argparse
+from array import array
+import struct
+import sys
+from Engine import SOLVERS, VISIT, FILL, solve
+from MazeFile import load_maze
+
+# Solver traces: a compact record of every cell a solver expanded or filled,
+# captured at full speed and replayed later at any speed.
+#
+# A Trace is itself an observer for the Engine solvers. Each event is packed
+# into one 64-bit integer, cell << 2 | event, and the final path is appended
+# as PATH events once the search returns. Trace files hold a small header
+# (magic, version, algorithm name, event count) and the packed events in
+# little-endian order.
+
+# Trace events, on top of Engine.VISIT and Engine.FILL
+PATH = 2  # Cell on the final path
+
+MAGIC = b"MTRC"
+VERSION = 1
+HEADER = struct.Struct("<4sBBHQ")
+
+class Trace:
+    def __init__(self, algorithm=""):
+        self.algorithm = algorithm
+        self.events = array('Q')
+
+    def __call__(self, event, cell):
+        self.events.append(cell << 2 | event)
+
+    def __len__(self):
+        return len(self.events)
+
+    # Solvers test `if observer`, which must hold even before any events
+    def __bool__(self):
+        return True
+
+    def __iter__(self):
+        for packed in self.events:
+            yield packed & 3, packed >> 2
+
+    def add_path(self, path):
+        self.events.extend(cell << 2 | PATH for cell in path)
+
+    # Cells recorded with the given event, in order
+    def cells(self, event):
+        return [packed >> 2 for packed in self.events if packed & 3 == event]
+
+    def save(self, filename):
+        name = self.algorithm.encode()
+        events = self.events
+        if sys.byteorder == "big":
+            events = array('Q', events)
+            events.byteswap()
+        with open(filename, "wb") as file:
+            file.write(HEADER.pack(MAGIC, VERSION, 0, len(name), len(events)))
+            file.write(name)
+            events.tofile(file)
+
+    @classmethod
+    def load(cls, filename):
+        with open(filename, "rb") as file:
+            magic, version, _, name_length, count = HEADER.unpack(file.read(HEADER.size))
+            if magic != MAGIC:
+                raise ValueError("not a trace file")
+            if version != VERSION:
+                raise ValueError(f"unsupported trace file version {version}")
+            trace = cls(file.read(name_length).decode())
+            trace.events.fromfile(file, count)
+        if sys.byteorder == "big":
+            trace.events.byteswap()
+        return trace
+
+# Run a solver headlessly and return its trace along with the usual result
+def record(algorithm_name, maze, start=None, goal=None, stats=None):
+    trace = Trace(algorithm_name)
+    path, moves = solve(algorithm_name, maze, start, goal, trace, stats=stats)
+    trace.add_path(path)
+    return trace, path, moves
+
+# Steps through a trace, calling paint(cell, event) for every event applied.
+# Seeking backwards repaints the touched cells with event None (untouched)
+# and replays from the beginning.
+class Replayer:
+    def __init__(self, trace, paint):
+        self.trace = trace
+        self.paint = paint
+        self.position = 0
+        self.state = {}  # Cell -> last event applied to it
+
+    # Apply the next count events; returns False once the trace is exhausted
+    def step(self, count=1):
+        events = self.trace.events
+        end = min(self.position + count, len(events))
+        for k in range(self.position, end):
+            cell, event = events[k] >> 2, events[k] & 3
+            self.state[cell] = event
+            self.paint(cell, event)
+        self.position = end
+        return end < len(events)
+
+    def seek(self, position):
+        if position < self.position:
+            for cell in self.state:
+                self.paint(cell, None)
+            self.state = {}
+            self.position = 0
+        self.step(position - self.position)
+
+    def finish(self):
+        self.seek(len(self.trace))
+
+# Animate a trace in a pygame window at speed events per second
+def replay_window(maze, trace, speed, seek=0):
+    import pygame
+    from Render import Renderer
+
+    colors = {VISIT: (0, 255, 255), FILL: (0, 0, 255), PATH: (255, 0, 255), None: (255, 255, 255)}
+    pygame.init()
+    cell_size = 20
+    screen = pygame.display.set_mode((maze.width * cell_size, maze.height * cell_size))
+    pygame.display.set_caption(f"Replay: {trace.algorithm}")
+    renderer = Renderer(screen, maze, cell_size, clock=pygame.time.Clock(), fps=min(speed, 60))
+    endpoints = {maze.start: (255, 0, 0), maze.goal: (0, 255, 0)}
+    renderer.draw_all(endpoints)
+
+    def paint(cell, event):
+        renderer.paint(cell, endpoints.get(cell, colors[event]))
+
+    replayer = Replayer(trace, paint)
+    replayer.seek(seek)
+    running = True
+    while True:
+        for event in pygame.event.get():
+            if event.type == pygame.QUIT:
+                pygame.quit()
+                return
+        if running:
+            running = replayer.step(max(1, speed // 60))
+        renderer.flush()
+
+# python Trace.py record maze.maze "Breadth-First Search" bfs.trace
+# python Trace.py replay maze.maze bfs.trace --speed 200 [--seek N] [--final bfs.png]
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Record and replay solver traces")
+    commands = parser.add_subparsers(dest="command", required=True)
+    record_parser = commands.add_parser("record")
+    record_parser.add_argument("maze")
+    record_parser.add_argument("solver", choices=list(SOLVERS))
+    record_parser.add_argument("trace")
+    replay_parser = commands.add_parser("replay")
+    replay_parser.add_argument("maze")
+    replay_parser.add_argument("trace")
+    replay_parser.add_argument("--speed", type=int, default=20, help="events per second")
+    replay_parser.add_argument("--seek", type=int, default=0, help="start from this event")
+    replay_parser.add_argument("--final", help="write the final frame to this PNG instead of animating")
+    args = parser.parse_args()
+
+    maze = load_maze(args.maze)
+    if args.command == "record":
+        trace, path, moves = record(args.solver, maze)
+        trace.save(args.trace)
+        print(f"{args.solver}: Path Length = {len(path)}, Moves Considered = {moves}, Events = {len(trace)}")
+    elif args.final:
+        from Export import export_png
+        trace = Trace.load(args.trace)
+        export_png(maze, args.final, trace.cells(PATH), trace.cells(VISIT) + trace.cells(FILL))
+    else:
+        replay_window(maze, Trace.load(args.trace), args.speed, args.seek)
@@ -0,0 +1,93 @@
+from array import array
+
+# Disjoint-set forest over integer ids 0..size-1 with union by rank and
+# path halving, stored in flat arrays so it scales to very large mazes.
+class UnionFind:
+    def __init__(self, size):
+        self.parent = array('i', range(size))
+        self.rank = bytearray(size)
+
+    def find(self, i):
+        parent = self.parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    # Merge the sets holding a and b; returns False if they were already joined
+    def union(self, a, b):
+        a, b = self.find(a), self.find(b)
+        if a == b:
+            return False
+        if self.rank[a] < self.rank[b]:
+            a, b = b, a
+        self.parent[b] = a
+        if self.rank[a] == self.rank[b]:
+            self.rank[a] += 1
+        return True
+
+    def connected(self, a, b):
+        return self.find(a) == self.find(b)
+
+# Connectivity of a changing set of maze cells, such as the player's path.
+# Adding a cell unions it with its neighbors in the set through open
+# passages. Removing a cell can split a set, which union-find cannot undo,
+# so a removal marks the structure dirty and the next query rebuilds it
+# from the current cells only.
+class CellConnectivity:
+    def __init__(self, maze):
+        self.maze = maze
+        self.cells = set()
+        self.sets = UnionFind(maze.size)
+        self.dirty = False
+
+    def __contains__(self, i):
+        return i in self.cells
+
+    def __len__(self):
+        return len(self.cells)
+
+    def __iter__(self):
+        return iter(self.cells)
+
+    def _reset(self, i):
+        self.sets.parent[i] = i
+        self.sets.rank[i] = 0
+
+    def add(self, i):
+        if i in self.cells:
+            return
+        self.cells.add(i)
+        if not self.dirty:
+            self._reset(i)
+            for n in self.maze.neighbors(i):
+                if n in self.cells:
+                    self.sets.union(i, n)
+
+    def remove(self, i):
+        if i not in self.cells:
+            return
+        self.cells.remove(i)
+        # A cell with no neighbors in the set was a singleton; nothing splits
+        if any(n in self.cells for n in self.maze.neighbors(i)):
+            self.dirty = True
+
+    def clear(self):
+        self.cells.clear()
+        self.dirty = False
+
+    def _rebuild(self):
+        for i in self.cells:
+            self._reset(i)
+        for i in self.cells:
+            for n in self.maze.neighbors(i):
+                if n in self.cells:
+                    self.sets.union(i, n)
+        self.dirty = False
+
+    def connected(self, a, b):
+        if a not in self.cells or b not in self.cells:
+            return False
+        if self.dirty:
+            self._rebuild()
+        return self.sets.connected(a, b)
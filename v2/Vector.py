@@ -0,0 +1,106 @@
+import numpy as np
+from Engine import VISIT
+from Grid import N, S, E, W
+
+# Breadth-first distance fields computed with NumPy, one whole BFS layer per
+# step instead of one cell per Python loop iteration.
+#
+# The grid is viewed as flat N/S/E/W bitmask planes. While the frontier is
+# large it is a boolean array and the next layer is found by shifting
+# (frontier & plane) by the direction's index offset. Walls at the edges of
+# the maze are closed, so the shifts never wrap between rows. While the
+# frontier is small (long corridors of a perfect maze) it is kept as an
+# index array instead, so a layer costs time proportional to its size.
+#
+# An observer is called with (VISIT, cell) for each cell as its layer is
+# reached; returning True aborts the search and distance_field returns None.
+
+DENSE_FRACTION = 64  # Switch to boolean planes above size / DENSE_FRACTION cells
+
+def distance_field(maze, source=None, goal=None, observer=None):
+    if source is None:
+        source = maze.start
+    w, size = maze.width, maze.size
+    cells = np.frombuffer(maze.cells, dtype=np.uint8)
+    directions = np.array([N, S, E, W], dtype=np.uint8)
+    offsets = np.array([-w, w, 1, -1], dtype=np.int64)
+    planes = [(cells & d) != 0 for d in directions]
+
+    dist = np.full(size, -1, dtype=np.int32)
+    dist[source] = 0
+    frontier = np.array([source], dtype=np.int64)
+    layer = 0
+    if observer and observer(VISIT, source):
+        return None
+
+    while len(frontier):
+        if goal is not None and dist[goal] >= 0:
+            break
+        layer += 1
+        if len(frontier) * DENSE_FRACTION > size:
+            # Dense layer: shift the boolean frontier along each open plane
+            current = np.zeros(size, dtype=bool)
+            current[frontier] = True
+            reached = np.zeros(size, dtype=bool)
+            for plane, offset in zip(planes, offsets):
+                moving = current & plane
+                if offset > 0:
+                    reached[offset:] |= moving[:-offset]
+                else:
+                    reached[:offset] |= moving[-offset:]
+            reached &= dist < 0
+            frontier = np.flatnonzero(reached)
+        else:
+            # Sparse layer: follow the open sides of each frontier cell
+            open_sides = (cells[frontier, None] & directions) != 0
+            reached = (frontier[:, None] + offsets)[open_sides]
+            frontier = np.unique(reached[dist[reached] < 0])
+        dist[frontier] = layer
+        if observer and any(observer(VISIT, int(i)) for i in frontier):
+            return None
+
+    return dist.reshape(maze.height, w)
+
+# Walk back from goal along strictly decreasing distances
+def path_from_field(maze, dist, goal=None):
+    if goal is None:
+        goal = maze.goal
+    flat = dist.reshape(-1)
+    if flat[goal] < 0:
+        return []
+    cells, steps = maze.cells, maze.steps
+    path = [goal]
+    i = goal
+    while flat[i] > 0:
+        for _, step in steps[cells[i]]:
+            if flat[i + step] == flat[i] - 1:
+                i += step
+                break
+        path.append(i)
+    path.reverse()
+    return path
+
+# Same interface as the Engine solvers; moves counts the cells reached
+def vector_bfs_solve(maze, start=None, goal=None, observer=None):
+    if start is None:
+        start = maze.start
+    if goal is None:
+        goal = maze.goal
+    dist = distance_field(maze, start, goal, observer)
+    if dist is None:
+        return None, float('inf')
+    return path_from_field(maze, dist, goal), int((dist >= 0).sum())
+
+# Distances from both ends; cells where they add up to the start-goal
+# distance lie on a shortest path
+def shortest_path_cells(maze, start=None, goal=None):
+    if start is None:
+        start = maze.start
+    if goal is None:
+        goal = maze.goal
+    from_start = distance_field(maze, start)
+    from_goal = distance_field(maze, goal)
+    length = from_start.reshape(-1)[goal]
+    if length < 0:
+        return np.zeros_like(from_start, dtype=bool)
+    return (from_start >= 0) & (from_goal >= 0) & (from_start + from_goal == length)
@@ -0,0 +1,175 @@
+import argparse
+import sys
+from Grid import N, S, E, W, OPPOSITE
+from MazeFile import load_maze
+
+# Low-memory solvers for mazes too large for the usual visited sets and
+# parent arrays, such as memory-mapped .maze files (see MazeFile.open_maze).
+#
+# Both solvers walk the maze one step at a time and keep only a few bits
+# per passage. Each cell owns its east and south passages, so a passage
+# array has two entries per cell; the north and west passages of a cell are
+# the south and east passages of its neighbors.
+#
+#   wall follower  (perfect mazes) keeps 1 parity bit per passage, 2 bits
+#                  per cell. Walking a tree with one hand on the wall crosses
+#                  every passage an even number of times, except the ones on
+#                  the path to the goal, which are crossed once.
+#   Tremaux        (any maze) keeps a 2-bit mark count per passage, 4 bits
+#                  per cell. When the goal is reached, the passages marked
+#                  exactly once form the path back to the start.
+#
+# Once the walk ends, the path is streamed from the start by following the
+# odd (or once-marked) passages, as a string of N/S/E/W letters.
+
+LETTERS = {N: "N", S: "S", E: "E", W: "W"}
+CLOCKWISE = (N, E, S, W)
+RIGHT_HAND = {d: (CLOCKWISE[(k + 1) % 4], d, CLOCKWISE[(k - 1) % 4], CLOCKWISE[(k + 2) % 4])
+              for k, d in enumerate(CLOCKWISE)}  # Turns to try, heading in each direction
+
+# A packed array of small counters, one per passage
+class PassageMarks:
+    def __init__(self, size, bits):
+        self.bits = bits
+        self.mask = (1 << bits) - 1
+        self.data = bytearray((2 * size * bits + 7) // 8)
+
+    # The passage from cell i in direction d, as (owning cell, slot)
+    @staticmethod
+    def _slot(maze, i, d):
+        if d == E:
+            return i, 0
+        if d == S:
+            return i, 1
+        if d == W:
+            return i - 1, 0
+        return i - maze.width, 1
+
+    def get(self, maze, i, d):
+        cell, slot = self._slot(maze, i, d)
+        bit = (2 * cell + slot) * self.bits
+        return self.data[bit >> 3] >> (bit & 7) & self.mask
+
+    def set(self, maze, i, d, value):
+        cell, slot = self._slot(maze, i, d)
+        bit = (2 * cell + slot) * self.bits
+        self.data[bit >> 3] = self.data[bit >> 3] & ~(self.mask << (bit & 7)) | value << (bit & 7)
+
+def _prepare(maze, start, goal):
+    if start is None:
+        start = maze.start
+    if goal is None:
+        goal = maze.goal
+    return start, goal
+
+# Follow the passages picked out by chosen(i, d) from start to goal,
+# yielding a letter per step; never steps straight back, and raises
+# ValueError(error) if the marks stop short or circle past size - 1 steps
+def _stream(maze, start, goal, chosen, error="marked passages do not lead to the goal"):
+    cells, offset = maze.cells, maze.offset
+    i, back, steps = start, None, 0
+    while i != goal:
+        for d in CLOCKWISE:
+            if cells[i] & d and d != back and chosen(i, d):
+                break
+        else:
+            raise ValueError(error)
+        steps += 1
+        if steps >= maze.size:
+            raise ValueError(error)
+        yield LETTERS[d]
+        i += offset[d]
+        back = OPPOSITE[d]
+
+# Right-hand wall follower for perfect mazes. Returns the steps walked and a
+# generator of the path's direction letters. A tree has size - 1 passages
+# and the walk crosses each at most twice, so a longer walk means the maze
+# has a loop that keeps the walker from the goal. A loop the walker does get
+# past leaves a circuit of odd passages, which the stream reports the same way.
+def wall_follower(maze, start=None, goal=None):
+    start, goal = _prepare(maze, start, goal)
+    cells, offset = maze.cells, maze.offset
+    parity = PassageMarks(maze.size, 1)
+    i, heading, moves = start, S, 0
+    limit = 2 * (maze.size - 1)
+
+    while i != goal:
+        if moves >= limit:
+            raise ValueError("maze is not perfect; use tremaux")
+        for d in RIGHT_HAND[heading]:
+            if cells[i] & d:
+                break
+        else:
+            raise ValueError("start cell has no open passage")
+        parity.set(maze, i, d, parity.get(maze, i, d) ^ 1)
+        i += offset[d]
+        heading = d
+        moves += 1
+
+    return moves, _stream(maze, start, goal, lambda i, d: parity.get(maze, i, d) == 1,
+                          "maze is not perfect; use tremaux")
+
+# Tremaux's algorithm: marks every passage as it is crossed, prefers
+# unmarked passages, turns back on reaching a visited cell by a new passage
+# and never takes a passage marked twice. Returns the steps walked and a
+# generator of the path's direction letters.
+def tremaux(maze, start=None, goal=None):
+    start, goal = _prepare(maze, start, goal)
+    cells, offset = maze.cells, maze.offset
+    marks = PassageMarks(maze.size, 2)
+    i, back, moves = start, None, 0
+
+    while i != goal:
+        open_sides = [d for d in CLOCKWISE if cells[i] & d]
+        counts = {d: marks.get(maze, i, d) for d in open_sides}
+        if back is not None and counts[back] == 1 and any(counts[d] for d in open_sides if d != back):
+            d = back  # Old cell reached by a new passage: retrace it
+        else:
+            candidates = [d for d in open_sides if d != back and counts[d] == 0]
+            if not candidates:
+                candidates = [d for d in open_sides if counts[d] == 1]
+            if not candidates:
+                raise ValueError("goal is not reachable")
+            d = candidates[0]
+        marks.set(maze, i, d, counts[d] + 1)
+        i += offset[d]
+        back = OPPOSITE[d]
+        moves += 1
+
+    return moves, _stream(maze, start, goal, lambda i, d: marks.get(maze, i, d) == 1)
+
+SOLVERS = {
+    "wall_follower": wall_follower,
+    "tremaux": tremaux,
+}
+
+# Write a stream of direction letters to out in chunks; returns the length
+def write_path(directions, out, chunk=1 << 16):
+    length = 0
+    buffer = []
+    for letter in directions:
+        buffer.append(letter)
+        if len(buffer) >= chunk:
+            out.write("".join(buffer))
+            length += len(buffer)
+            buffer.clear()
+    out.write("".join(buffer))
+    return length + len(buffer)
+
+# python Walk.py huge.maze --solver tremaux --output path.txt
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve a maze with a low-memory walker")
+    parser.add_argument("maze")
+    parser.add_argument("--solver", choices=list(SOLVERS), default="wall_follower")
+    parser.add_argument("--output", help="write the path's N/S/E/W letters here (default: stdout)")
+    args = parser.parse_args()
+
+    maze = load_maze(args.maze)
+    moves, directions = SOLVERS[args.solver](maze)
+    if args.output:
+        with open(args.output, "w") as out:
+            length = write_path(directions, out)
+    else:
+        length = write_path(directions, sys.stdout)
+        print()
+    print(f"{args.solver}: Path Length = {length + 1}, Steps Walked = {moves}", file=sys.stderr)